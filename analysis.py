@@ -0,0 +1,254 @@
+"""Exact Markov-chain analysis of Board layouts
+
+A player's position at the end of each of their turns is a Markov chain over the
+100 squares, with square 99 absorbing. Everything here is computed from that
+chain with NumPy linear algebra, no games are sampled.
+
+Requires NumPy (see requirements-dev.txt).
+
+Usage: python analysis.py [win probability]
+"""
+import sys
+
+import numpy as np
+
+from board import Board, DIFFICULTIES, LAYOUTS
+
+NUM_SQUARES = 100
+END = NUM_SQUARES - 1
+
+
+def win_probabilities(board, win_prob):
+    """Get the minigame win probability of every square
+
+    Parameters
+    ----------
+    board : Board
+        Board to play on
+    win_prob : float or dict
+        Probability of winning a minigame, either for every difficulty or as a
+        dict of difficulty -> probability
+
+    Returns
+    -------
+    np.ndarray
+        Win probability indexed by position
+    """
+    if not isinstance(win_prob, dict):
+        win_prob = {"easy": win_prob, "medium": win_prob, "hard": win_prob}
+    return np.array([win_prob[difficulty] for difficulty in DIFFICULTIES])
+
+
+def roll_matrices():
+    """Get the transition matrices of a single forwards and backwards roll
+
+    Returns
+    -------
+    np.ndarray, np.ndarray
+        forwards[a, b] and backwards[a, b] are the probabilities that a roll
+        moves a player from a to b
+    """
+    src = np.repeat(np.arange(NUM_SQUARES), 6)
+    roll = np.tile(np.arange(1, 7), NUM_SQUARES)
+
+    forwards = np.zeros((NUM_SQUARES, NUM_SQUARES))
+    backwards = np.zeros((NUM_SQUARES, NUM_SQUARES))
+    np.add.at(forwards, (src, np.minimum(src + roll, END)), 1 / 6)
+    np.add.at(backwards, (src, np.maximum(src - roll, 0)), 1 / 6)
+    return forwards, backwards
+
+
+class BoardAnalysis:
+    def __init__(self, board, win_prob=0.5, start=0):
+        """Markov chain of a single player's position on a board
+
+        Parameters
+        ----------
+        board : Board
+            Board to analyse
+        win_prob : float or dict, optional
+            Probability of winning a minigame, either for every difficulty or
+            as a dict of difficulty -> probability, by default 0.5
+        start : int, optional
+            Starting position, by default 0
+        """
+        self.board = board
+        self.start = start
+        self.win = win_probabilities(board, win_prob)
+
+        forwards, backwards = roll_matrices()
+        p = self.win
+        n = NUM_SQUARES
+        identity = np.eye(n)
+
+        # resolution of the square a player lands on: snakes and ladders move
+        # the player directly, special squares roll again forwards on a win and
+        # backwards on a loss, so the landing matrix is defined in terms of
+        # itself and solved as a linear system
+        #   (I - diag(win * special) F - diag(loss * special) B) L = D
+        kinds = np.frombuffer(board.kinds, dtype=np.uint8)
+        dests = np.frombuffer(board.dests, dtype=np.uint8)
+        snakes = np.flatnonzero(kinds == Board.SNAKE_SQUARE)
+        ladders = np.flatnonzero(kinds == Board.LADDER_SQUARE)
+        special = (kinds == Board.SPECIAL_SQUARE).astype(float)
+        self.action = (kinds != Board.NORMAL_SQUARE).astype(float)
+
+        direct = identity.copy()
+        direct[snakes, snakes] = p[snakes]
+        direct[snakes, dests[snakes]] += 1 - p[snakes]
+        direct[ladders, ladders] = 1 - p[ladders]
+        direct[ladders, dests[ladders]] += p[ladders]
+        direct[special == 1] = 0
+        self.rerolls = (special * p)[:, None] * forwards + (
+            special * (1 - p)
+        )[:, None] * backwards
+        self.landing = np.linalg.solve(identity - self.rerolls, direct)
+
+        # transition matrix of a whole turn
+        self.transition = forwards @ self.landing
+        self.forwards = forwards
+
+        # fundamental matrix of the transient squares, fundamental[a, b] is the
+        # expected number of turns ending on b when starting from a
+        q = self.transition[:END, :END]
+        self.fundamental = np.linalg.inv(np.eye(END) - q)
+
+    def expected_turns(self):
+        """Expected number of turns for a single player to finish"""
+        return self.fundamental[self.start].sum()
+
+    def turns_variance(self):
+        """Variance of the number of turns for a single player to finish"""
+        t = self.fundamental.sum(axis=1)
+        second = (2 * self.fundamental - np.eye(END)) @ t
+        return second[self.start] - t[self.start] ** 2
+
+    def turn_distribution(self, max_turns=500):
+        """Distribution of the number of turns for a single player to finish
+
+        Parameters
+        ----------
+        max_turns : int, optional
+            Number of turns to compute, by default 500
+
+        Returns
+        -------
+        np.ndarray
+            dist[k] is the probability of finishing on turn k (dist[0] == 0)
+        """
+        state = np.zeros(NUM_SQUARES)
+        state[self.start] = 1
+        finished = np.zeros(max_turns + 1)
+        for k in range(1, max_turns + 1):
+            state = state @ self.transition
+            finished[k] = state[END]
+        return np.diff(finished, prepend=0)
+
+    def hitting_probabilities(self):
+        """Probability of ending at least one turn on each square
+
+        Returns
+        -------
+        np.ndarray
+            Hitting probability indexed by position (the start is always 1)
+        """
+        n = self.fundamental
+        hits = np.ones(NUM_SQUARES)
+        hits[:END] = n[self.start] / np.diag(n)
+        return hits
+
+    def expected_minigames(self):
+        """Expected number of minigames played by a single player in a game"""
+        # minigames played from landing on a square, including re-rolls
+        per_landing = np.linalg.solve(np.eye(NUM_SQUARES) - self.rerolls, self.action)
+        per_turn = self.forwards @ per_landing
+        return self.fundamental[self.start] @ per_turn[:END]
+
+    def game_distribution(self, num_players=2, max_turns=500):
+        """Distribution of rounds and winners of a game with several players
+
+        Players move independently, so the game ends on the first round that
+        any of them finishes, and players earlier in the turn order win ties.
+
+        Parameters
+        ----------
+        num_players : int, optional
+            Number of players, by default 2
+        max_turns : int, optional
+            Number of rounds to compute, by default 500
+
+        Returns
+        -------
+        np.ndarray
+            wins[i, k] is the probability that player i wins on round k
+        """
+        dist = self.turn_distribution(max_turns)
+        done_before = np.cumsum(dist) - dist  # P(T < k)
+        not_done = 1 - done_before  # P(T >= k)
+        not_done_after = 1 - np.cumsum(dist)  # P(T > k)
+
+        wins = np.empty((num_players, max_turns + 1))
+        for i in range(num_players):
+            wins[i] = (
+                dist * not_done_after ** i * not_done ** (num_players - 1 - i)
+            )
+        return wins
+
+    def summary(self, num_players=2):
+        """Get the headline figures of the board
+
+        Returns
+        -------
+        dict
+            Expected turns and their standard deviation for one player, expected
+            minigames per player, expected rounds and win share by turn order
+            for a game of num_players
+        """
+        wins = self.game_distribution(num_players)
+        rounds = np.arange(wins.shape[1])
+        return {
+            "expected_turns": self.expected_turns(),
+            "turns_std": np.sqrt(self.turns_variance()),
+            "expected_minigames": self.expected_minigames(),
+            "expected_rounds": (wins.sum(axis=0) * rounds).sum(),
+            "win_share": wins.sum(axis=1),
+        }
+
+
+def rank_boards(boards, win_prob=0.5, num_players=2, key="expected_rounds"):
+    """Rank boards by one of the figures of BoardAnalysis.summary
+
+    Parameters
+    ----------
+    boards : list of (str, Board)
+        Named boards
+    win_prob : float or dict, optional
+        Probability of winning a minigame, by default 0.5
+    num_players : int, optional
+        Number of players, by default 2
+    key : str, optional
+        Figure to sort by, by default "expected_rounds"
+
+    Returns
+    -------
+    list of (str, dict)
+        Board names and their summaries, in ascending order of key
+    """
+    summaries = [
+        (name, BoardAnalysis(board, win_prob).summary(num_players))
+        for name, board in boards
+    ]
+    return sorted(summaries, key=lambda item: item[1][key])
+
+
+if __name__ == "__main__":
+    win_prob = float(sys.argv[1]) if len(sys.argv) > 1 else 0.5
+    boards = [(name, Board(*layout)) for name, *layout in LAYOUTS]
+    for name, summary in rank_boards(boards, win_prob):
+        print(
+            f"{name}: {summary['expected_turns']:.2f} turns "
+            f"(std {summary['turns_std']:.2f}), "
+            f"{summary['expected_minigames']:.2f} minigames, "
+            f"{summary['expected_rounds']:.2f} rounds in a 2 player game, "
+            f"win share {np.round(summary['win_share'], 3)}"
+        )
@@ -0,0 +1,189 @@
+"""Image caches shared by the game and the minigames
+
+Set SNAKES_ASSET_REPORT=1 to print the load time and pixel memory of every image
+when the game exits.
+"""
+import atexit
+import os
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+import pygame
+
+
+class AssetManager:
+    def __init__(self):
+        """Loads every image file once and converts it to the display format once
+
+        Images loaded before the display exists are converted the first time
+        they are requested after it has been created. Cached surfaces are shared
+        between callers, so they must not be drawn on.
+        """
+        self.images = {}  # (path, alpha) -> surface
+        self.scaled_images = {}  # (path, alpha, size, colorkey) -> surface
+        self.unconverted = set()  # keys of images loaded before the display
+        self.load_times = {}  # path -> nanoseconds spent decoding/converting
+
+    def image(self, path, alpha=True):
+        """Get the surface of an image file
+
+        Parameters
+        ----------
+        path : str
+            Path of the image
+        alpha : bool, optional
+            Keep per-pixel alpha, by default True
+
+        Returns
+        -------
+        pygame.Surface
+            Image in the display pixel format (once a display exists)
+        """
+        key = (os.path.normpath(path), alpha)
+        surf = self.images.get(key)
+        if surf is None:
+            start = time.perf_counter_ns()
+            surf = pygame.image.load(path)
+            self.unconverted.add(key)
+            self.images[key] = surf
+            self.load_times[key[0]] = self.load_times.get(key[0], 0) + time.perf_counter_ns() - start
+
+        if key in self.unconverted and pygame.display.get_surface() is not None:
+            start = time.perf_counter_ns()
+            surf = surf.convert_alpha() if alpha else surf.convert()
+            self.unconverted.discard(key)
+            self.images[key] = surf
+            self.load_times[key[0]] += time.perf_counter_ns() - start
+        return surf
+
+    def scaled(self, path, size, alpha=True, colorkey=None):
+        """Get the surface of an image file scaled to a given size
+
+        Parameters
+        ----------
+        path : str
+            Path of the image
+        size : (int, int)
+            Width and height
+        alpha : bool, optional
+            Keep per-pixel alpha, by default True
+        colorkey : tuple, optional
+            Color made transparent (with RLE acceleration), by default None.
+            Cached surfaces are shared, so set it here rather than on the
+            returned surface
+
+        Returns
+        -------
+        pygame.Surface
+            Scaled image in the display pixel format (once a display exists)
+        """
+        key = (os.path.normpath(path), alpha, tuple(size), None if colorkey is None else tuple(colorkey))
+        surf = self.scaled_images.get(key)
+        if surf is None:
+            image = self.image(path, alpha)
+            start = time.perf_counter_ns()
+            surf = pygame.transform.scale(image, key[2])
+            if colorkey is not None:
+                surf.set_colorkey(colorkey, pygame.RLEACCEL)
+            self.load_times[key[0]] += time.perf_counter_ns() - start
+            # only keep the scaled copy once it is in the display format
+            if (key[0], alpha) not in self.unconverted:
+                self.scaled_images[key] = surf
+        return surf
+
+    def report(self):
+        """Get the load time and memory use of every asset
+
+        Returns
+        -------
+        list of (str, float, int)
+            Path, milliseconds spent loading/converting/scaling and bytes of
+            pixel memory of every cached surface of that path, largest first
+        """
+        memory = {}
+        for key, surf in (*self.images.items(), *self.scaled_images.items()):
+            size = surf.get_width() * surf.get_height() * surf.get_bytesize()
+            memory[key[0]] = memory.get(key[0], 0) + size
+        rows = [(path, ns / 1e6, memory.get(path, 0)) for path, ns in self.load_times.items()]
+        return sorted(rows, key=lambda row: row[2], reverse=True)
+
+    def print_report(self):
+        """Print the report (see report) as a table"""
+        print(f"{'asset':50} {'load ms':>9} {'KiB':>9}")
+        for path, ms, nbytes in self.report():
+            print(f"{path:50} {ms:9.2f} {nbytes / 1024:9.1f}")
+
+
+class PageCache:
+    def __init__(self, paths, alpha=False, max_bytes=32 * 1024 * 1024):
+        """LRU cache of a sequence of large images decoded in the background
+
+        Meant for pages shown one at a time (e.g. the instructions): pages are
+        decoded on a worker thread when prefetched and converted to the display
+        format on the main thread when first shown.
+
+        Parameters
+        ----------
+        paths : list of str
+            Path of each page
+        alpha : bool, optional
+            Keep per-pixel alpha, by default False
+        max_bytes : int, optional
+            Maximum total pixel memory of the converted pages, by default 32 MiB
+        """
+        self.paths = list(paths)
+        self.alpha = alpha
+        self.max_bytes = max_bytes
+        self.pages = OrderedDict()  # index -> converted surface, least recently used first
+        self.nbytes = 0
+        self.pending = {}  # index -> future of the decoded surface
+        self.executor = ThreadPoolExecutor(max_workers=1)
+        self.decodes = 0
+
+    def __len__(self):
+        return len(self.paths)
+
+    def prefetch(self, index):
+        """Start decoding a page in the background unless it is loaded or loading"""
+        index %= len(self.paths)
+        if index not in self.pages and index not in self.pending:
+            self.pending[index] = self.executor.submit(pygame.image.load, self.paths[index])
+            self.decodes += 1
+
+    def get(self, index):
+        """Get a page in the display format, waiting for it if it is still loading
+
+        Parameters
+        ----------
+        index : int
+            Index of the page (wraps around)
+
+        Returns
+        -------
+        pygame.Surface
+            Page in the display format
+        """
+        index %= len(self.paths)
+        surf = self.pages.get(index)
+        if surf is not None:
+            self.pages.move_to_end(index)
+            return surf
+
+        self.prefetch(index)
+        surf = self.pending.pop(index).result()
+        surf = surf.convert_alpha() if self.alpha else surf.convert()
+        self.pages[index] = surf
+        self.nbytes += surf.get_width() * surf.get_height() * surf.get_bytesize()
+        while self.nbytes > self.max_bytes and len(self.pages) > 1:
+            _, old = self.pages.popitem(last=False)
+            self.nbytes -= old.get_width() * old.get_height() * old.get_bytesize()
+        return surf
+
+
+# process-wide asset manager
+assets = AssetManager()
+
+
+if os.environ.get("SNAKES_ASSET_REPORT") == "1":
+    atexit.register(assets.print_report)
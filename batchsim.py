@@ -0,0 +1,197 @@
+"""Vectorized simulation of many games at once
+
+Holds the positions of every game in NumPy arrays and plays the same turn of all
+unfinished games with one set of array operations, following the rules of
+engine.Engine with minigame outcomes drawn at random.
+
+Requires NumPy (see requirements-dev.txt).
+
+Usage: python batchsim.py [number of games] [win probability]
+"""
+import sys
+import time
+
+import numpy as np
+
+from analysis import win_probabilities
+from board import Board, LAYOUTS
+
+NUM_SQUARES = 100
+END = NUM_SQUARES - 1
+
+# square kinds of the transition table
+NORMAL = Board.NORMAL_SQUARE
+SNAKE = Board.SNAKE_SQUARE
+LADDER = Board.LADDER_SQUARE
+SPECIAL = Board.SPECIAL_SQUARE
+
+
+def transition_table(board, win_prob=0.5):
+    """Precompute the lookup arrays used to play a board
+
+    Parameters
+    ----------
+    board : Board
+        Board to play on
+    win_prob : float or dict, optional
+        Probability of winning a minigame, either for every difficulty or as a
+        dict of difficulty -> probability, by default 0.5
+
+    Returns
+    -------
+    np.ndarray, np.ndarray, np.ndarray
+        Square kind (NORMAL, SNAKE, LADDER or SPECIAL), destination after going
+        down a snake/up a ladder and minigame win probability, indexed by
+        position
+    """
+    kind = np.frombuffer(board.kinds, dtype=np.uint8)
+    dest = np.frombuffer(board.dests, dtype=np.uint8).astype(np.int64)
+    return kind, dest, win_probabilities(board, win_prob)
+
+
+class BatchResult:
+    def __init__(self, winners, turns, num_players, snake_hits, ladder_hits):
+        """Outcome of a batch of simulated games
+
+        Parameters
+        ----------
+        winners : np.ndarray
+            Winning player of each game (-1 if it ran out of turns)
+        turns : np.ndarray
+            Number of turns (of all players) played in each game
+        num_players : int
+            Number of players in each game
+        snake_hits : np.ndarray
+            Number of times a player landed on each snake head, by position
+        ladder_hits : np.ndarray
+            Number of times a player landed on each ladder bottom, by position
+        """
+        self.winners = winners
+        self.turns = turns
+        self.num_players = num_players
+        self.snake_hits = snake_hits
+        self.ladder_hits = ladder_hits
+
+    def win_share(self):
+        """Fraction of the games won by each player in turn order"""
+        counts = np.bincount(self.winners[self.winners >= 0], minlength=self.num_players)
+        return counts / len(self.winners)
+
+    def turn_histogram(self):
+        """Number of games that lasted each number of turns (indexed by turns)"""
+        return np.bincount(self.turns)
+
+    def summary(self):
+        """Get the headline figures of the batch
+
+        Returns
+        -------
+        dict
+            Number of games, win share by turn order and the mean and
+            percentiles of the number of turns
+        """
+        p50, p90, p99 = np.percentile(self.turns, [50, 90, 99])
+        return {
+            "games": len(self.winners),
+            "win_share": self.win_share(),
+            "mean_turns": self.turns.mean(),
+            "p50_turns": p50,
+            "p90_turns": p90,
+            "p99_turns": p99,
+        }
+
+
+def simulate(board, num_games, num_players=2, win_prob=0.5, rng=None, max_turns=10000):
+    """Play num_games games of a board together
+
+    Parameters
+    ----------
+    board : Board
+        Board to play on
+    num_games : int
+        Number of games to play
+    num_players : int, optional
+        Number of players in each game, by default 2
+    win_prob : float or dict, optional
+        Probability of winning a minigame, either for every difficulty or as a
+        dict of difficulty -> probability, by default 0.5
+    rng : np.random.Generator, optional
+        Random number generator, by default a new unseeded one
+    max_turns : int, optional
+        Stop games that last longer than this many turns, by default 10000
+
+    Returns
+    -------
+    BatchResult
+        Winner and number of turns of every game, and snake/ladder hit counts
+    """
+    if rng is None:
+        rng = np.random.default_rng()
+    kind, dest, win = transition_table(board, win_prob)
+
+    positions = np.zeros((num_games, num_players), dtype=np.int64)
+    winners = np.full(num_games, -1, dtype=np.int64)
+    turns = np.full(num_games, max_turns, dtype=np.int64)
+    snake_hits = np.zeros(NUM_SQUARES, dtype=np.int64)
+    ladder_hits = np.zeros(NUM_SQUARES, dtype=np.int64)
+
+    # indices of the games that are still being played
+    active = np.arange(num_games)
+    for turn in range(max_turns):
+        if active.size == 0:
+            break
+        p = turn % num_players
+        pos = positions[active, p]
+        direction = np.ones(active.size, dtype=np.int64)
+        finished = np.zeros(active.size, dtype=bool)
+
+        # indices into active of the games whose player still has to roll,
+        # special squares send players back here to roll again
+        rolling = np.arange(active.size)
+        while rolling.size:
+            new = pos[rolling] + direction[rolling] * rng.integers(1, 7, rolling.size)
+            np.clip(new, 0, END, out=new)
+            pos[rolling] = new
+
+            done = new == END
+            finished[rolling[done]] = True
+
+            # resolve the snake/ladder/special squares players landed on
+            landed = kind[new] != NORMAL
+            landed &= ~done
+            rolling, new = rolling[landed], new[landed]
+            square = kind[new]
+            won = rng.random(rolling.size) < win[new]
+            snake_hits += np.bincount(new[square == SNAKE], minlength=NUM_SQUARES)
+            ladder_hits += np.bincount(new[square == LADDER], minlength=NUM_SQUARES)
+
+            moves = ((square == SNAKE) & ~won) | ((square == LADDER) & won)
+            pos[rolling[moves]] = dest[new[moves]]
+
+            again = square == SPECIAL
+            rolling = rolling[again]
+            direction[rolling] = np.where(won[again], 1, -1)
+
+        positions[active, p] = pos
+        winners[active[finished]] = p
+        turns[active[finished]] = turn + 1
+        active = active[~finished]
+
+    return BatchResult(winners, turns, num_players, snake_hits, ladder_hits)
+
+
+if __name__ == "__main__":
+    num_games = int(sys.argv[1]) if len(sys.argv) > 1 else 1000000
+    win_prob = float(sys.argv[2]) if len(sys.argv) > 2 else 0.5
+    rng = np.random.default_rng()
+    for name, *layout in LAYOUTS:
+        start = time.perf_counter()
+        summary = simulate(Board(*layout), num_games, win_prob=win_prob, rng=rng).summary()
+        elapsed = time.perf_counter() - start
+        print(
+            f"{name}: {summary['games']} games in {elapsed:.2f}s, "
+            f"{summary['mean_turns']:.2f} turns on average "
+            f"(p50 {summary['p50_turns']:.0f}, p90 {summary['p90_turns']:.0f}, "
+            f"p99 {summary['p99_turns']:.0f}), "
+            f"win share {np.round(summary['win_share'], 3)}"
+        )
@@ -0,0 +1,345 @@
+"""Headless rendering benchmark of the board and the minigames
+
+Every scenario draws frames with the game's own drawing code, driven by a
+scripted sequence of inputs and a fixed seed, on a dummy display so no window is
+needed. Each scenario reports frames per second and the Python memory allocated
+per frame (traced with tracemalloc in a separate pass, so tracing doesn't slow
+down the timed frames; pixel buffers allocated by SDL aren't traced).
+
+Allocations are compared with the baseline committed in benchmark_baseline.json
+and frame rates with the one in benchmark_fps.json, which isn't committed since
+it only holds on the machine that saved it. Both are written by --save-baseline.
+The script exits with status 1 if a scenario is slower or allocates more than the
+tolerance allows, or if there is no allocation baseline to compare with.
+
+Usage: python benchmark.py [--save-baseline] [frames]
+"""
+import json
+import os
+import random
+import sys
+import time
+import tracemalloc
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import pygame
+
+from asset_manager import assets
+from board import Board
+from engine import Engine, RandomOutcomes
+import lifecycle
+import minigames
+
+WIDTH, HEIGHT, FPS = 1280, 720, 60
+SEED = 3
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+BASELINE = os.path.join(HERE, "benchmark_baseline.json")  # bytes per frame, committed
+FPS_BASELINE = os.path.join(HERE, "benchmark_fps.json")  # frames per second, machine-local
+TOLERANCE = 0.2  # allowed relative slowdown / allocation growth
+ALLOC_SLACK = 1024  # bytes per frame of allocation growth always allowed
+
+
+def board_scenario(screen, clock, font):
+    """Board with two players moved by a headless engine every 10 frames"""
+    from game import Game
+
+    icons = [assets.image("./images/alarm.png"), assets.image("./images/bell.png")]
+    board = Board()
+    game = Game(screen, clock, font, WIDTH, HEIGHT, FPS, 2, icons, board, autostart=False)
+    game.engine = Engine(board, 2, RandomOutcomes(0.5, random), rng=random)
+
+    def frame(i):
+        if i % 10 == 0:
+            if game.engine.play_turn():
+                game.engine.players[:] = [0, 0]
+            game.engine.next_turn()
+            game.prompt = f"P{game.turn + 1}'s turn"
+        game.draw_board()
+        game.draw_players()
+        pygame.display.update()
+
+    return frame
+
+
+def ladder_climb_scenario(screen, clock, font):
+    """Clouds and snakes spawning while the player switches ladders"""
+    minigame = minigames.load("ladder_climb")("hard", screen, clock, font, WIDTH, HEIGHT, FPS)
+    minigame.start_time = time.time()
+    keys = [pygame.K_RIGHT, pygame.K_RIGHT, pygame.K_LEFT, pygame.K_LEFT]
+
+    def frame(i):
+        # the minigame's timers are replaced by the script
+        pygame.event.clear()
+        if i % 30 == 0:
+            minigame.handle_event(pygame.event.Event(minigame.NEW_CLOUD))
+        if i % 3 == 0:
+            minigame.handle_event(pygame.event.Event(minigame.NEW_SNAKE))
+        if i % 20 == 0:
+            minigame.handle_event(pygame.event.Event(pygame.KEYDOWN, key=keys[i // 20 % 4]))
+        minigame.elapsed = i / FPS % minigame.time_to_beat
+        minigame.clouds.update()
+        minigame.snakes.update()
+        minigame.player.update()
+        minigame.draw()
+        pygame.display.update()
+
+    return frame
+
+
+def snake_charmer_scenario(screen, clock, font):
+    """Words spawning every 15 frames, typed a letter every 4 frames"""
+    minigame = minigames.load("snake_charmer")("hard", screen, clock, font, WIDTH, HEIGHT, FPS)
+    minigame.clear_typed()
+    target = [""]
+
+    def frame(i):
+        elapsed_time = i / FPS
+        if i % 15 == 0:
+            index = minigame.free_index()
+            if index != -1:
+                minigame.set_word(index, minigame.spawn_word(), elapsed_time, (47, 191, 113))
+        if i % 4 == 0:
+            if not target[0]:
+                target[0] = next((slot.word for slot in minigame.spawned_words if slot.word), "")
+            if len(minigame.typed_word) < len(target[0]):
+                minigame.type_text(target[0][len(minigame.typed_word)])
+            elif target[0]:
+                minigame.user_submit()
+                target[0] = ""
+        if minigame.snake.sprite.get_actual_hp() <= 0:
+            minigame.snake.sprite.target_health = minigame.snake.sprite.maximum_health
+        minigame.draw_frame(elapsed_time)
+        minigame.despawn_word(elapsed_time)
+        pygame.display.update()
+
+    return frame
+
+
+def tile_memory_scenario(screen, clock, font):
+    """Mouse hovering over every tile in turn, flipping one every 25 frames"""
+    minigame = minigames.load("tile_memory")("hard", screen, clock, font, WIDTH, HEIGHT, FPS)
+    n = minigame.board_width
+    flipped = [[False] * n for _ in range(n)]
+    hover = [None]
+    screen.fill((0, 0, 0))
+    minigame.draw_board(flipped)
+
+    def frame(i):
+        tile = divmod(i // 5 % (n * n), n)
+        if i % 25 == 0:
+            flipped[tile[0]][tile[1]] = True
+            minigame.draw_tiles(flipped, [tile], hover[0])
+            if all(map(all, flipped)):
+                for row in flipped:
+                    row[:] = [False] * n
+                minigame.draw_board(flipped)
+        minigame.draw_tiles(flipped, [t for t in (hover[0], tile) if t is not None], tile)
+        hover[0] = tile
+
+    return frame
+
+
+def simon_says_scenario(screen, clock, font):
+    """Grid with a different tile highlighted every 10 frames
+
+    Doesn't cover the pauses between highlights or the handling of clicks.
+    """
+    minigame = minigames.load("simon_says")("hard", screen, clock, font, WIDTH, HEIGHT, FPS)
+
+    def frame(i):
+        minigame.draw_grid()
+        minigame.highlight(minigame.rects[i // 10 % len(minigame.rects)], (47, 191, 113))
+
+    return frame
+
+
+def snake_game_scenario(screen, clock, font):
+    """Snake of 30 blocks steered around a square by an arrow key every 8 frames
+
+    Doesn't cover eating the food (which moves every 20 frames) or collisions.
+    """
+    minigame = minigames.load("snake_game")("hard", screen, clock, font, WIDTH, HEIGHT, FPS)
+    block = minigame.snake_block
+    cols, rows = WIDTH // block, HEIGHT // block
+    keys = [pygame.K_RIGHT, pygame.K_DOWN, pygame.K_LEFT, pygame.K_UP]
+    snake_list = []
+    head = [WIDTH // 2 - 4 * block, HEIGHT // 2 - 4 * block, 0, 0, 5]  # x, y, x/y change, direction
+    food = [0, 0]
+
+    def frame(i):
+        if i % 8 == 0:
+            event = pygame.event.Event(pygame.KEYDOWN, key=keys[i // 8 % 4])
+            turn = minigame.steer(event.key, head[4])
+            if turn is not None:
+                head[2:] = turn
+        head[0] += head[2]
+        head[1] += head[3]
+        snake_list.append(head[:2])
+        if len(snake_list) > 30:
+            del snake_list[0]
+        if i % 20 == 0:
+            food[:] = random.randrange(cols) * block, random.randrange(rows) * block
+        minigame.draw_frame(food[0], food[1], snake_list, 6 - i // 20 % 7)
+        pygame.display.update()
+
+    return frame
+
+
+# scenario name -> function setting it up and returning a function drawing frame i
+SCENARIOS = {
+    "board": board_scenario,
+    "ladder_climb": ladder_climb_scenario,
+    "snake_charmer": snake_charmer_scenario,
+    "tile_memory": tile_memory_scenario,
+    "simon_says": simon_says_scenario,
+    "snake_game": snake_game_scenario,
+}
+
+
+def measure(name, screen, clock, font, frames=600, warmup=60):
+    """Run a scenario, once timed and once with allocation tracing
+
+    Parameters
+    ----------
+    name : str
+        Scenario name (a key of SCENARIOS)
+    screen, clock, font
+        Display surface, clock and font passed to the game objects
+    frames : int, optional
+        Number of measured frames of each pass, by default 600
+    warmup : int, optional
+        Number of frames drawn before measuring (fills caches), by default 60
+
+    Returns
+    -------
+    dict
+        Frames per second, and mean bytes allocated per frame and still alive
+        at the end of the frame
+    """
+    random.seed(SEED)
+    # timers and key repeat set up by the scenario end with it
+    with lifecycle.Scope(name):
+        frame = SCENARIOS[name](screen, clock, font)
+        for i in range(warmup):
+            frame(i)
+
+        start = time.perf_counter()
+        for i in range(warmup, warmup + frames):
+            frame(i)
+        elapsed = time.perf_counter() - start
+
+        allocated = retained = 0
+        tracemalloc.start()
+        try:
+            for i in range(warmup + frames, warmup + 2 * frames):
+                tracemalloc.clear_traces()  # also resets the peak
+                frame(i)
+                current, peak = tracemalloc.get_traced_memory()
+                allocated += peak
+                retained += current
+        finally:
+            tracemalloc.stop()
+
+    return {
+        "fps": round(frames / elapsed, 1),
+        "alloc_bytes": round(allocated / frames),
+        "retained_bytes": round(retained / frames),
+    }
+
+
+def run(frames=600):
+    """Run every scenario on a dummy display
+
+    Returns
+    -------
+    dict
+        Scenario name -> figures (see measure)
+    """
+    pygame.init()
+    screen = pygame.display.set_mode([WIDTH, HEIGHT])
+    clock = pygame.time.Clock()
+    font = pygame.font.SysFont("comicsans", 28)
+    return {name: measure(name, screen, clock, font, frames) for name in SCENARIOS}
+
+
+def compare(results, baseline, tolerance=TOLERANCE):
+    """Print results next to a baseline and find the regressions
+
+    Parameters
+    ----------
+    results : dict
+        Figures of this run (see run)
+    baseline : dict
+        Figures of the baseline run, or None
+    tolerance : float, optional
+        Allowed relative slowdown or allocation growth, by default TOLERANCE
+
+    Returns
+    -------
+    list of str
+        Description of every regression
+    """
+    regressions = []
+    print(f"{'scenario':15} {'fps':>9} {'base':>9} {'alloc B':>9} {'base':>9} {'kept B':>9}")
+    for name, figures in results.items():
+        base = (baseline or {}).get(name)
+        base_fps = "-" if base is None or "fps" not in base else f"{base['fps']:9.1f}"
+        base_alloc = "-" if base is None else f"{base['alloc_bytes']:9d}"
+        print(
+            f"{name:15} {figures['fps']:9.1f} {base_fps:>9} "
+            f"{figures['alloc_bytes']:9d} {base_alloc:>9} {figures['retained_bytes']:9d}"
+        )
+        if base is None:
+            continue
+        if "fps" in base and figures["fps"] < base["fps"] * (1 - tolerance):
+            regressions.append(f"{name}: {figures['fps']} fps, baseline {base['fps']}")
+        if figures["alloc_bytes"] > base["alloc_bytes"] * (1 + tolerance) + ALLOC_SLACK:
+            regressions.append(
+                f"{name}: {figures['alloc_bytes']} bytes per frame, baseline {base['alloc_bytes']}"
+            )
+    return regressions
+
+
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    save = "--save-baseline" in args
+    args = [arg for arg in args if arg != "--save-baseline"]
+    frames = int(args[0]) if args else 600
+
+    # assets are loaded relative to the repository
+    os.chdir(os.path.dirname(os.path.abspath(__file__)))
+    results = run(frames)
+
+    baseline = None
+    if os.path.exists(BASELINE):
+        with open(BASELINE) as f:
+            baseline = json.load(f)
+        if os.path.exists(FPS_BASELINE):
+            with open(FPS_BASELINE) as f:
+                for name, fps in json.load(f).items():
+                    if name in baseline:
+                        baseline[name]["fps"] = fps
+    regressions = compare(results, baseline)
+
+    if save:
+        with open(BASELINE, "w") as f:
+            allocations = {
+                name: {key: value for key, value in figures.items() if key != "fps"}
+                for name, figures in results.items()
+            }
+            json.dump(allocations, f, indent=2)
+            f.write("\n")
+        with open(FPS_BASELINE, "w") as f:
+            json.dump({name: figures["fps"] for name, figures in results.items()}, f, indent=2)
+        print(f"baseline saved to {BASELINE} and {FPS_BASELINE}")
+    elif baseline is None:
+        print(f"no baseline at {BASELINE}, save one with --save-baseline")
+        sys.exit(1)
+    elif regressions:
+        print("REGRESSIONS:")
+        for regression in regressions:
+            print("  " + regression)
+        sys.exit(1)
@@ -0,0 +1,182 @@
+import random
+from types import MappingProxyType
+
+# board layouts to choose from: name, snakes, ladders and number of special squares
+LAYOUTS = [
+    ("Board 1", {96: 77, 94: 55, 87: 23, 61: 17, 47: 25, 35: 5, 31: 9}, {1: 37, 3: 13, 7: 29, 27: 73, 20: 41, 49: 66, 70: 91, 79: 98}, 7),
+    ("Board 2", {16: 6, 61: 19, 86: 23, 53: 31, 63: 59, 92: 72, 97: 78, 94: 49}, {3: 13, 8: 30, 27: 83, 20: 41, 1: 37, 50: 66, 70: 90, 55: 77}, 9),
+    ("Board 3", {46: 4, 29: 8, 37: 14, 96: 24, 61: 36, 85: 53, 91: 69, 52: 32}, {80: 98, 84: 94, 73: 87, 40: 78, 19: 76, 31: 67, 7: 33, 1: 22}, 7),
+]
+
+# row and column of every position (the board snakes left to right, then right
+# to left), shared by every board
+ROWS = bytes(pos // 10 for pos in range(100))
+COLS = bytes(pos % 10 if pos // 10 % 2 == 0 else 9 - pos % 10 for pos in range(100))
+
+# minigame difficulty of every position
+DIFFICULTIES = tuple(
+    "easy" if pos < 33 else "medium" if pos < 66 else "hard" for pos in range(100)
+)
+
+
+class Board:
+    SNAKE_SQUARE = 0
+    LADDER_SQUARE = 1
+    SPECIAL_SQUARE = 2
+    NORMAL_SQUARE = 3  # only used in kinds, get_square returns None instead
+
+    # get_square result of each kind
+    SQUARE_TYPES = (SNAKE_SQUARE, LADDER_SQUARE, SPECIAL_SQUARE, None)
+
+    __slots__ = ("snakes", "ladders", "special", "kinds", "dests", "rows", "cols", "centers")
+
+    def __init__(
+        self,
+        snakes={96: 77, 94: 55, 87: 23, 61: 17, 47: 25, 35: 5, 31: 9},
+        ladders={1: 37, 3: 13, 7: 29, 27: 73, 20: 41, 49: 66, 70: 91, 79: 98},
+        nspecial=5,
+        special=None,
+    ):
+        """Game board
+
+        The board contains positions from 0 (start, bottom left) to 99 (end, top left)
+
+        Parameters
+        ----------
+        snakes : dict, optional
+            Head positions -> tail positions
+        ladders : dict, optional
+            Bottom bottom -> top position
+        nspecial : int, optional
+            Number of special squares to generate, by default 5
+        special : iterable of int, optional
+            Positions of the special squares, instead of generating nspecial
+            random ones, by default None
+
+        Note
+        ----
+        The board is compiled into immutable lookup tables indexed by position,
+        shared by the renderer, the engine and the simulators:
+        kinds (square type, NORMAL_SQUARE for normal squares), dests (position
+        after going down a snake/up a ladder, else the position itself), rows
+        and cols. get_centers gives the pixel centers for a screen height.
+        """
+        for k, v in snakes.items():
+            assert 0 < k < 99 and 0 < v < 99
+
+        for k, v in ladders.items():
+            assert 0 < k < 99 and 0 < v < 99
+
+        assert len(snakes) < 10 and len(ladders) < 10 and nspecial < 10
+
+        self.snakes = MappingProxyType(dict(snakes))
+        self.ladders = MappingProxyType(dict(ladders))
+
+        # generate nspecial random positions for the special squares
+        # don't include square 0 or square 99 or squares used by snakes/ladders
+        used_squares = (
+            set(self.snakes.keys())
+            | set(self.ladders.keys())
+            | set(self.snakes.values())
+            | set(self.ladders.values())
+        )
+        unused_squares = set(range(1, 99)) - used_squares
+        if special is None:
+            special = random.sample(sorted(unused_squares), nspecial)
+        self.special = tuple(special)
+
+        # compile the lookup tables, snakes take precedence over ladders and
+        # ladders over special squares
+        kinds = bytearray([self.NORMAL_SQUARE] * 100)
+        dests = bytearray(range(100))
+        for pos in self.special:
+            kinds[pos] = self.SPECIAL_SQUARE
+        for bottom, top in self.ladders.items():
+            kinds[bottom] = self.LADDER_SQUARE
+            dests[bottom] = top
+        for head, tail in self.snakes.items():
+            kinds[head] = self.SNAKE_SQUARE
+            dests[head] = tail
+        self.kinds = bytes(kinds)
+        self.dests = bytes(dests)
+        self.rows = ROWS
+        self.cols = COLS
+
+        # screen height -> pixel centers, see get_centers
+        self.centers = {}
+
+    def __reduce__(self):
+        return Board, (dict(self.snakes), dict(self.ladders), len(self.special), self.special)
+
+    def get_coord(self, pos):
+        """Get row and col of a give position
+
+        Row 0 is bottom-most, column 0 is left-most
+
+        Parameters
+        ----------
+        pos : int
+            Position
+
+        Returns
+        -------
+        int, int
+            Row and column
+        """
+        return self.rows[pos], self.cols[pos]
+
+    def get_centers(self, h):
+        """Get the pixel center of every square for a given screen height
+
+        Squares are h // 12 pixels wide, with a one square margin to the left and
+        two squares at the bottom of the screen.
+
+        Parameters
+        ----------
+        h : int
+            Height of screen
+
+        Returns
+        -------
+        tuple of (int, int)
+            Pixel center indexed by position
+        """
+        centers = self.centers.get(h)
+        if centers is None:
+            s = h // 12
+            centers = tuple(
+                (s + c * s + s // 2, h - 2 * s - r * s + s // 2)
+                for r, c in zip(self.rows, self.cols)
+            )
+            self.centers[h] = centers
+        return centers
+
+    def get_square(self, pos):
+        """Get type of square at a given position (None if it is "normal")
+
+        Parameters
+        ----------
+        pos : int
+            Position
+
+        Returns
+        -------
+        int or None
+            Type of square at pos
+        """
+        return self.SQUARE_TYPES[self.kinds[pos]]
+
+    def get_difficulty(self, pos):
+        """Get the minigame difficulty for a given position
+
+        Parameters
+        ----------
+        pos : int
+            Position
+
+        Returns
+        -------
+        str
+            "easy", "medium" or "hard"
+        """
+        return DIFFICULTIES[pos]
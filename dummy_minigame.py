@@ -1,5 +1,7 @@
 import pygame
 
+from pacing import FramePacer
+
 red = (255, 0, 0)
 green = (0, 255, 0)
 blue = (0, 0, 255)
@@ -39,6 +41,8 @@ class DummyMinigame:
         """Return True if minigame is won, else False"""
         self.draw()
         pygame.display.update()
+        # tick through a pacer so SNAKES_MAX_FPS caps the loop
+        pacer = FramePacer(self.clock, self.fps)
         while True:
             ###### DELETE THE BELOW AND ADD GAME LOGIC ######
             import time
@@ -47,7 +51,7 @@ class DummyMinigame:
             if random.random() < 1 / (10 * self.fps):
                 return random.random() < 0.5
 
-            self.clock.tick(self.fps)
+            pacer.tick()
             ###### DELETE THE BELOW AND ADD GAME LOGIC ######
 
             self.draw()
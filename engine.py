@@ -0,0 +1,174 @@
+"""Headless Super Snakes and Ladders rules
+
+Nothing in here imports pygame, so the rules can be played out at full speed for
+testing and balancing. Game renders an Engine by listening to its turns.
+"""
+import random
+
+from board import Board
+
+
+class TurnListener:
+    """Receives the steps of a turn as an Engine plays them
+
+    Every method does nothing by default, subclasses override the steps they
+    care about.
+    """
+
+    def before_roll(self, player, backwards):
+        """Called before a player rolls (backwards is True for a losing re-roll)"""
+
+    def rolled(self, player, n):
+        """Called after a player rolls n (negative when moving backwards)"""
+
+    def moved(self, player, old, new):
+        """Called after a player moved from old to new by their roll"""
+
+    def landed(self, player, square):
+        """Called before the minigame of a snake/ladder/special square"""
+
+    def resolved(self, player, square, won, old, new):
+        """Called after a minigame moved the player from old to new"""
+
+
+class RandomOutcomes:
+    def __init__(self, win_prob=0.5, rng=None):
+        """Minigame outcome provider that wins with a fixed probability
+
+        Parameters
+        ----------
+        win_prob : float or dict, optional
+            Probability of winning a minigame, either for every difficulty or
+            as a dict of difficulty -> probability, by default 0.5
+        rng : random.Random, optional
+            Random number generator, by default a new unseeded one
+        """
+        if not isinstance(win_prob, dict):
+            win_prob = {"easy": win_prob, "medium": win_prob, "hard": win_prob}
+        self.win_prob = win_prob
+        self.rng = rng if rng is not None else random.Random()
+
+    def __call__(self, player, pos, difficulty):
+        return self.rng.random() < self.win_prob[difficulty]
+
+
+class Engine:
+    def __init__(self, board, num_players, outcomes, listener=None, rng=None, start=0):
+        """Game state and turn sequence of Super Snakes and Ladders
+
+        Parameters
+        ----------
+        board : Board
+            Board to play on
+        num_players : int
+            Number of players
+        outcomes : callable
+            Minigame outcome provider, called as outcomes(player, pos, difficulty)
+            and returning True if the player won the minigame
+        listener : TurnListener, optional
+            Receives each step of a turn, by default None
+        rng : random.Random, optional
+            Random number generator for the dice, by default a new unseeded one
+        start : int, optional
+            Starting position of every player, by default 0
+        """
+        self.board = board
+        self.outcomes = outcomes
+        self.listener = listener
+        self.rng = rng if rng is not None else random.Random()
+
+        # players[a] = b, such that a is the player number and b is
+        # their position on the board
+        self.players = [start] * num_players
+
+        # turn represents the current player who has their turn
+        self.turn = 0
+
+    def roll(self):
+        """Simulate dice roll."""
+        # same distribution as rng.randint(1, 6) at a fraction of the cost
+        return int(self.rng.random() * 6) + 1
+
+    def play_turn(self):
+        """Play the current player's turn
+
+        Rolls and moves the player, then resolves the snake/ladder/special square
+        they land on. A special square makes the player roll again, forwards if
+        they won its minigame and backwards if they lost it.
+
+        Returns
+        -------
+        bool
+            True if the player has won the game, else False
+        """
+        p = self.turn
+        board = self.board
+        kinds, dests = board.kinds, board.dests
+        players = self.players
+        listener = self.listener
+
+        backwards = False
+        while True:
+            if listener is not None:
+                listener.before_roll(p, backwards)
+            n = self.roll()
+            if backwards:
+                n = -n
+            if listener is not None:
+                listener.rolled(p, n)
+
+            old = players[p]
+            new = min(max(old + n, 0), 99)  # make sure we don't go over/under
+            players[p] = new
+            if listener is not None:
+                listener.moved(p, old, new)
+
+            if new >= 99:  # they've won the game
+                return True
+
+            square = kinds[new]
+            if square == Board.NORMAL_SQUARE:
+                return False
+
+            if listener is not None:
+                listener.landed(p, square)
+            won = self.outcomes(p, new, board.get_difficulty(new))
+
+            if square == Board.SNAKE_SQUARE:
+                dest = new if won else dests[new]
+            elif square == Board.LADDER_SQUARE:
+                dest = dests[new] if won else new
+            else:
+                dest = new
+            players[p] = dest
+            if listener is not None:
+                listener.resolved(p, square, won, new, dest)
+
+            if square != Board.SPECIAL_SQUARE:
+                return False
+            backwards = not won
+
+    def next_turn(self):
+        """Pass the turn to the next player"""
+        self.turn = (self.turn + 1) % len(self.players)
+
+    def play_game(self, max_turns=None):
+        """Play turns until a player wins
+
+        Parameters
+        ----------
+        max_turns : int, optional
+            Give up after this many turns, by default None (no limit)
+
+        Returns
+        -------
+        int, int
+            Winning player (None if max_turns ran out) and number of turns played
+        """
+        turns = 0
+        while max_turns is None or turns < max_turns:
+            turns += 1
+            if self.play_turn():
+                return self.turn, turns
+            self.next_turn()
+        return None, turns
@@ -0,0 +1,193 @@
+"""Per-frame timing of the game loops
+
+Every game loop gets a FrameStats from begin() when it starts, calls frame() at
+the top of each frame and mark(phase) after each phase of the frame (events,
+update, draw, flip, tick). Time is accumulated into per-phase histograms for each
+loop, across every time the loop is played.
+
+Set SNAKES_FRAME_STATS to a file path to write a CSV summary of every loop when
+the game exits, and SNAKES_FRAME_OVERLAY=1 to show the figures on screen.
+"""
+import atexit
+import csv
+import os
+import time
+
+import pygame
+
+from text import render_text
+
+BUCKET_NS = 250000  # histogram resolution (0.25 ms)
+NUM_BUCKETS = 800  # up to 200 ms, slower frames go in the last bucket
+
+OVERLAY = os.environ.get("SNAKES_FRAME_OVERLAY") == "1"
+OVERLAY_REFRESH = 30  # frames between overlay text updates
+
+
+class FrameStats:
+    def __init__(self, name, fps):
+        """Frame time histograms of one game loop
+
+        Parameters
+        ----------
+        name : str
+            Name of the loop
+        fps : int
+            Target frames per second, frames taking more than 1.5 times the
+            frame budget count as dropped
+        """
+        self.name = name
+        self.drop_ns = int(1.5e9 / fps)
+        self.histograms = {}  # phase -> list of counts per bucket
+        self.totals = {}  # phase -> total ns
+        self.maxima = {}  # phase -> slowest ns
+        self.frames = 0
+        self.dropped = 0
+        self.frame_start = None
+        self.last = None
+        self.font = None
+        self.overlay_text = ""
+
+    def reset_frame(self):
+        """Forget the current frame (the loop was paused or restarted)"""
+        self.frame_start = None
+        self.last = time.perf_counter_ns()
+
+    def resume_frame(self):
+        """Restart the current frame now, not counting the time until now (the
+        loop was asleep waiting for input)"""
+        self.frame_start = self.last = time.perf_counter_ns()
+
+    def record(self, phase, ns):
+        histogram = self.histograms.get(phase)
+        if histogram is None:
+            histogram = self.histograms[phase] = [0] * NUM_BUCKETS
+            self.totals[phase] = 0
+            self.maxima[phase] = 0
+        histogram[min(ns // BUCKET_NS, NUM_BUCKETS - 1)] += 1
+        self.totals[phase] += ns
+        if ns > self.maxima[phase]:
+            self.maxima[phase] = ns
+
+    def frame(self):
+        """Start a new frame, ending the previous one"""
+        now = time.perf_counter_ns()
+        if self.frame_start is not None:
+            ns = now - self.frame_start
+            self.record("frame", ns)
+            self.frames += 1
+            if ns > self.drop_ns:
+                self.dropped += 1
+        self.frame_start = self.last = now
+
+    def mark(self, phase):
+        """End a phase of the current frame (time since the last mark)"""
+        now = time.perf_counter_ns()
+        self.record(phase, now - self.last)
+        self.last = now
+
+    def percentile(self, phase, q):
+        """Get the q-th percentile of a phase in milliseconds (bucket upper edge)"""
+        histogram = self.histograms.get(phase)
+        if not histogram:
+            return 0.0
+        target = q / 100 * sum(histogram)
+        count = 0
+        for i, n in enumerate(histogram):
+            count += n
+            if count >= target and n:
+                return (i + 1) * BUCKET_NS / 1e6
+        return NUM_BUCKETS * BUCKET_NS / 1e6
+
+    def summary(self):
+        """Get the figures of every phase
+
+        Returns
+        -------
+        list of dict
+            Loop, phase, samples, dropped frames, mean/p50/p95/p99/max ms
+        """
+        rows = []
+        for phase, histogram in self.histograms.items():
+            samples = sum(histogram)
+            rows.append(
+                {
+                    "loop": self.name,
+                    "phase": phase,
+                    "samples": samples,
+                    "dropped": self.dropped if phase == "frame" else "",
+                    "mean_ms": round(self.totals[phase] / samples / 1e6, 3),
+                    "p50_ms": self.percentile(phase, 50),
+                    "p95_ms": self.percentile(phase, 95),
+                    "p99_ms": self.percentile(phase, 99),
+                    "max_ms": round(self.maxima[phase] / 1e6, 3),
+                }
+            )
+        return rows
+
+    def draw_overlay(self, screen):
+        """Draw the frame figures in the top right corner if the overlay is on
+
+        Returns
+        -------
+        pygame.Rect or None
+            Area drawn on, None if the overlay is off
+        """
+        if not OVERLAY:
+            return None
+        if self.font is None:
+            self.font = pygame.font.SysFont("monospace", 14)
+        if self.frames % OVERLAY_REFRESH == 0:
+            self.overlay_text = (
+                f"{self.name} p50 {self.percentile('frame', 50):.2f} "
+                f"p95 {self.percentile('frame', 95):.2f} "
+                f"p99 {self.percentile('frame', 99):.2f} ms "
+                f"dropped {self.dropped}/{self.frames}"
+            )
+        surf = render_text(self.overlay_text, self.font, (255, 255, 0))
+        rect = surf.get_rect(topright=(screen.get_width(), 0))
+        screen.fill((0, 0, 0), rect)
+        screen.blit(surf, rect)
+        return rect
+
+
+# loop name -> FrameStats
+loops = {}
+
+
+def begin(name, fps):
+    """Get the FrameStats of a loop that is about to start
+
+    Parameters
+    ----------
+    name : str
+        Name of the loop
+    fps : int
+        Target frames per second
+
+    Returns
+    -------
+    FrameStats
+        Stats of the loop, shared by every run of it
+    """
+    stats = loops.get(name)
+    if stats is None:
+        stats = loops[name] = FrameStats(name, fps)
+    stats.reset_frame()
+    return stats
+
+
+def write_csv(path):
+    """Write the summary of every loop to a CSV file"""
+    rows = [row for stats in loops.values() for row in stats.summary()]
+    with open(path, "w", newline="") as f:
+        writer = csv.DictWriter(
+            f,
+            ["loop", "phase", "samples", "dropped", "mean_ms", "p50_ms", "p95_ms", "p99_ms", "max_ms"],
+        )
+        writer.writeheader()
+        writer.writerows(rows)
+
+
+if os.environ.get("SNAKES_FRAME_STATS"):
+    atexit.register(write_csv, os.environ["SNAKES_FRAME_STATS"])
@@ -5,11 +5,13 @@ import pygame
 from pygame import Rect
 from random import randint
 
-from simon_says import SimonSays
-from ladder_climb import LadderClimb
-from snake_charmer import SnakeCharmer
-from snake_game import SnakeGame
-from tile_memory import TileMemory
+from board import Board
+from engine import Engine, TurnListener
+import frame_stats
+import lifecycle
+import minigames
+from pacing import FramePacer
+from text import draw_text, render_text
 
 
 # color scheme
@@ -30,15 +32,6 @@ white = (255, 255, 255)
 black = (0, 0, 0)
 
 
-def draw_text(text, font, color, screen, x, y, center=True):
-    textobj = font.render(text, 1, color)
-    textrect = textobj.get_rect()
-    if center:
-        textrect.center = (x, y)
-    else:
-        textrect.topleft = (x, y)
-    screen.blit(textobj, textrect)
-
 def smooth_motion(t, b, c):
     """Computes points along a 1D line for a smooth accelerated/decelerated motion.
 
@@ -69,11 +62,23 @@ def smooth_motion(t, b, c):
     return -a / 3 * t ** 3 + a * b / 2 * t ** 2
 
 
-class Game:
-    minigames = [SimonSays, LadderClimb, SnakeCharmer, TileMemory, SnakeGame]
+class Game(TurnListener):
+    # minigames are imported the first time they are played, see minigames.load
+    minigames = ["simon_says", "ladder_climb", "snake_charmer", "tile_memory", "snake_game"]
 
     def __init__(
-        self, screen, clock, font, w, h, fps, num_players, player_icons, board
+        self,
+        screen,
+        clock,
+        font,
+        w,
+        h,
+        fps,
+        num_players,
+        player_icons,
+        board,
+        dirty_rects=True,
+        autostart=True,
     ):
         """Game instance of Super Snakes and Ladders
 
@@ -93,6 +98,15 @@ class Game:
             Frames per second
         num_players : int
             Number of players (2 <= num_players <= 4)
+        player_icons : list of pygame.Surface
+            Icon for each player
+        board : Board
+            Board to play on
+        dirty_rects : bool, optional
+            Only push the rects that changed to the display when animating a
+            player, instead of the full frame, by default True
+        autostart : bool, optional
+            Start playing as soon as the game is created, by default True
         """
         assert 2 <= num_players <= 4
 
@@ -116,23 +130,52 @@ class Game:
 
         # generate pygame.Rect's for the board squares
         s = h // 12
-        coords = list(map(self.board.get_coord, list(range(100))))
-        self.squares = [Rect(s + c * s, h - 2 * s - r * s, s, s) for r, c in coords]
+        rows, cols = self.board.rows, self.board.cols
+        self.squares = [Rect(s + c * s, h - 2 * s - r * s, s, s) for r, c in zip(rows, cols)]
+        self.centers = self.board.get_centers(h)
 
         # button/prompt
         self.button_roll = Rect(s * 14, s * 5, s * 4, s * 4)
         self.box_prompt = Rect(self.w // 2 - 2*s, 10, s * 4, s)
         self.prompt = ""
 
-        # players[a] = b, such that a is the player number and b is
-        # their position on the board
-        self.players = [98] * num_players
-
-        # turn represents the current player who has their turn
-        self.turn = 0
+        # pre-rendered static board layer (see get_board_layer)
+        self.board_layer = None
+        self.board_layer_key = None
+
+        # dirty-rect animation state (see begin_animation)
+        self.dirty_rects = dirty_rects
+        self.anim_background = None
+        self.anim_rect = None
+
+        # game state and turn logic, minigames decide the outcomes and each
+        # step of a turn is drawn as the engine plays it
+        self.engine = Engine(
+            board,
+            num_players,
+            outcomes=self.play_minigame,
+            listener=self,
+            rng=random,
+            start=98,
+        )
 
         # start the game :D
-        self.play_game()
+        if autostart:
+            self.play_game()
+
+    @property
+    def players(self):
+        """Position of each player"""
+        return self.engine.players
+
+    @property
+    def turn(self):
+        """Player who has their turn"""
+        return self.engine.turn
+
+    @turn.setter
+    def turn(self, value):
+        self.engine.turn = value
 
     @property
     def p(self):
@@ -174,81 +217,154 @@ class Game:
             Number of seconds the animation lasts, by default 0.
         """
         v3 = v2 - v1  # vector from old position (v1) to new position (v2)
-        ticks = int(seconds * self.fps)  # number of ticks it will take to animate
+        stats = frame_stats.begin("board", self.fps)
+        pacer = FramePacer(self.clock, self.fps, stats=stats)
+        ticks = int(seconds * pacer.fps)  # number of ticks it will take to animate
 
-        for t in range(ticks):
-            scale = smooth_motion(t, ticks, ticks) / ticks  # scale v3 by this
-            pos = (v1 + scale * v3).xy
+        if not self.dirty_rects:
+            for t in range(ticks):
+                stats.frame()
+                scale = smooth_motion(t, ticks, ticks) / ticks  # scale v3 by this
+                pos = (v1 + scale * v3).xy
 
-            self.draw_board()
-            self.draw_players(False)
-            self.screen.blit(
-                self.player_icons[self.p],
-                pos,
-            )
-            pygame.display.update()
+                self.draw_board()
+                self.draw_players(False)
+                self.screen.blit(
+                    self.player_icons[self.p],
+                    pos,
+                )
+                stats.draw_overlay(self.screen)
+                stats.mark("draw")
+                pygame.display.update()
+                stats.mark("flip")
 
-            self.clock.tick(self.fps)
+                pacer.tick()
+                stats.mark("tick")
+            return
 
-    def move(self, n):
-        """Move the current player n squares
+        # an animation started by move() shares its background across hops
+        owns_background = self.anim_background is None
+        if owns_background:
+            self.begin_animation()
 
-        Parameters
-        ----------
-        n : int
-            Number of square to move (move backwards if negative)
+        icon = self.player_icons[self.p]
+        overlay = None  # area of the frame stats overlay drawn last frame
+        for t in range(ticks):
+            stats.frame()
+            scale = smooth_motion(t, ticks, ticks) / ticks  # scale v3 by this
+            rect = icon.get_rect(topleft=(v1 + scale * v3).xy)
+
+            # restore the background under the icon's previous position
+            dirty = [rect]
+            if self.anim_rect is not None:
+                self.screen.blit(self.anim_background, self.anim_rect, self.anim_rect)
+                dirty.append(self.anim_rect)
+            # and under the previous overlay, whose text may have been wider
+            if overlay is not None:
+                self.screen.blit(self.anim_background, overlay, overlay)
+                dirty.append(overlay)
+
+            self.screen.blit(icon, rect)
+            overlay = stats.draw_overlay(self.screen)
+            if overlay is not None:
+                dirty.append(overlay)
+            stats.mark("draw")
+            pygame.display.update(dirty)
+            stats.mark("flip")
+            self.anim_rect = rect
+
+            pacer.tick()
+            stats.mark("tick")
+
+        if owns_background:
+            self.end_animation()
+
+    def begin_animation(self):
+        """Draw the frame without the current player and keep a copy of it
+
+        The copy is the background that dirty-rect animation restores under the
+        player's icon as it moves.
         """
-        old_pos = self.pos
-        new_pos = min(max(old_pos + n, 0), 99)  # make sure we don't go over/under
-        self.players[self.p] = new_pos
+        self.draw_board()
+        self.draw_players(False)
+        pygame.display.update()
+        self.anim_background = self.screen.copy()
+        self.anim_rect = None
+
+    def end_animation(self):
+        """Drop the background kept by begin_animation"""
+        self.anim_background = None
+        self.anim_rect = None
+
+    def before_roll(self, player, backwards):
+        """Wait for the player to press roll"""
+        self.wait_for_click()
 
-        if n > 0:  # move forwards
-            positions = list(range(old_pos, new_pos + 1))
+    def rolled(self, player, n):
+        """Show the player's roll"""
+        self.prompt = f"P{player + 1} rolled a {n}"
+
+    def moved(self, player, old, new):
+        """Animate the player moving square by square from old to new"""
+        if new > old:  # move forwards
+            positions = list(range(old, new + 1))
         else:  # move backwards
-            positions = list(range(old_pos, new_pos - 1, -1))
+            positions = list(range(old, new - 1, -1))
 
-        for old, new in zip(positions[:-1], positions[1:]):
-            v1 = pygame.math.Vector2(self.squares[old].center)
-            v2 = pygame.math.Vector2(self.squares[new].center)
+        if self.dirty_rects:
+            self.begin_animation()
+        for src, dst in zip(positions[:-1], positions[1:]):
+            v1 = pygame.math.Vector2(self.centers[src])
+            v2 = pygame.math.Vector2(self.centers[dst])
             self.animate(v1, v2)
+        if self.dirty_rects:
+            self.end_animation()
+
+    def landed(self, player, square):
+        """Prompt the player to start the minigame of the square they landed on"""
+        if square == Board.SNAKE_SQUARE:
+            self.prompt = f"P{player + 1} landed on a snake! Play a minigame."
+            button_text = "Start Minigame"
+        elif square == Board.LADDER_SQUARE:
+            self.prompt = f"P{player + 1} has landed on a ladder! Play a minigame."
+            button_text = "Play Minigame"
+        else:
+            self.prompt = f"P{player + 1} landed on a special square! Play a minigame."
+            button_text = "Play Minigame"
 
-    def snake(self):
-        """Make the current player go down the snake"""
-        self.prompt = f"P{self.p + 1} landed on a snake! Play a minigame."
-        self.draw_board("Start Minigame")
+        self.draw_board(button_text)
         self.draw_players()
         pygame.display.update()
         self.wait_for_click()
 
-        minigame_won = self.play_minigame()
-        if minigame_won:
-            self.prompt = f"P{self.p + 1} won the minigame and get's to stay put"
+    def resolved(self, player, square, won, old, new):
+        """Show the minigame result and animate going down a snake/up a ladder"""
+        if square == Board.SNAKE_SQUARE:
+            if won:
+                self.prompt = f"P{player + 1} won the minigame and get's to stay put"
+            else:
+                self.prompt = f"P{player + 1} lost the minigame and slides down the snake"
+        elif square == Board.LADDER_SQUARE:
+            if won:
+                self.prompt = (
+                    f"P{player + 1} won the minigame and get's to climb the ladder"
+                )
+            else:
+                self.prompt = f"P{player + 1} lost the minigame and has to stay put"
         else:
-            self.prompt = f"P{self.p + 1} lost the minigame and slides down the snake"
-            v2 = pygame.math.Vector2(self.squares[self.board.snakes[self.pos]].center)
-            v1 = pygame.math.Vector2(self.squares[self.pos].center)
-            self.animate(v1, v2, seconds=1)
-            self.players[self.p] = self.board.snakes[self.pos]
+            if won:
+                self.prompt = f"P{player + 1} won the minigame and get's to roll again to go forwards"
+            else:
+                self.prompt = f"P{player + 1} lost the minigame and has to roll again to go backwards"
 
-    def ladder(self):
-        """Make the current player go up the ladder"""
-        self.prompt = f"P{self.p + 1} has landed on a ladder! Play a minigame."
-        self.draw_board("Play Minigame")
-        self.draw_players()
-        pygame.display.update()
-        self.wait_for_click()
+            self.draw_board()
+            self.draw_players()
+            pygame.display.update()
 
-        minigame_won = self.play_minigame()
-        if minigame_won:
-            self.prompt = (
-                f"P{self.p + 1} won the minigame and get's to climb the ladder"
-            )
-            v1 = pygame.math.Vector2(self.squares[self.pos].center)
-            v2 = pygame.math.Vector2(self.squares[self.board.ladders[self.pos]].center)
+        if new != old:
+            v1 = pygame.math.Vector2(self.centers[old])
+            v2 = pygame.math.Vector2(self.centers[new])
             self.animate(v1, v2, seconds=1)
-            self.players[self.p] = self.board.ladders[self.pos]
-        else:
-            self.prompt = f"P{self.p + 1} lost the minigame and has to stay put"
 
     def draw_board(self, button_text="Roll"):
         """Draw the board, buttons, and prompt
@@ -263,8 +379,8 @@ class Game:
         pygame.display.update() needs to be called to update the screen.
         self.prompt determines the text to be drawn for the prompt.
         """
-        # draw background (draws over everything, acts as a screen clear)
-        self.screen.fill(azure)
+        # draw the static board (acts as a screen clear)
+        self.screen.blit(self.get_board_layer(), (0, 0))
 
         # draw the button
         pygame.draw.rect(self.screen, red_crayola, self.button_roll)
@@ -273,38 +389,71 @@ class Game:
         # draw the prompt
         draw_text(self.prompt, self.font, rich_black, self.screen, *self.box_prompt.center)
 
+    def get_board_layer(self):
+        """Get the pre-rendered static layer of the board
+
+        The layer holds the background, squares, square numbers, snakes, ladders
+        and special squares. It is built once and rebuilt only when the board or
+        the screen size changes.
+
+        Returns
+        -------
+        pygame.Surface
+            Surface the size of the screen with the static board drawn on it
+        """
+        key = (self.board, self.screen.get_size())
+        if self.board_layer is None or key != self.board_layer_key:
+            self.board_layer = self.render_board_layer()
+            self.board_layer_key = key
+        return self.board_layer
+
+    def render_board_layer(self):
+        """Render the static parts of the board onto a new surface
+
+        Returns
+        -------
+        pygame.Surface
+            Surface the size of the screen with the static board drawn on it
+        """
+        layer = self.screen.copy()
+
+        # draw background
+        layer.fill(azure)
+
         # draw the squares
         for i, sq in enumerate(self.squares):
-            pygame.draw.rect(self.screen, rich_black, sq)
-            pygame.draw.rect(self.screen, white, sq, width=2)
-            self.screen.blit(
-                self.font.render(str(i + 1), True, white),
+            pygame.draw.rect(layer, rich_black, sq)
+            pygame.draw.rect(layer, white, sq, width=2)
+            layer.blit(
+                render_text(str(i + 1), self.font, white),
                 (sq.left + 5, sq.top + 5),
             )
 
         # draw the snakes
         for start, end in self.board.snakes.items():
             pygame.draw.line(
-                self.screen,
+                layer,
                 emerald,
-                self.squares[start].center,
-                self.squares[end].center,
+                self.centers[start],
+                self.centers[end],
                 width=4,
             )
 
         # draw the ladders
         for start, end in self.board.ladders.items():
             pygame.draw.line(
-                self.screen,
+                layer,
                 princeton_orange,
-                self.squares[start].center,
-                self.squares[end].center,
+                self.centers[start],
+                self.centers[end],
                 width=4,
             )
 
         # draw the special squares
         for pos in self.board.special:
-            pygame.draw.rect(self.screen, red_crayola, self.squares[pos], width=4)
+            pygame.draw.rect(layer, red_crayola, self.squares[pos], width=4)
+
+        return layer
 
     def draw_players(self, draw_current_player=True):
         """Draw the players on the board
@@ -319,7 +468,7 @@ class Game:
                 continue
             self.screen.blit(
                 self.player_icons[p],
-                self.squares[player].center,
+                self.centers[player],
             )
 
     def wait_for_click(self):
@@ -335,90 +484,44 @@ class Game:
                 if self.button_roll.collidepoint(event.pos):
                     return
 
-    def roll(self):
-        """Simulate dice roll."""
-        return random.randint(1, 6)
+    def play_minigame(self, player, pos, difficulty):
+        """Start a new minigame (outcome provider of the engine)
 
-    def play_minigame(self):
-        """Start a new minigame
+        Parameters
+        ----------
+        player : int
+            Player playing the minigame
+        pos : int
+            Position of the player
+        difficulty : str
+            "easy", "medium" or "hard"
 
         Returns
         -------
         bool
             True if the minigame was won, else False
         """
-        if self.pos < 33:
-            difficulty = "easy"
-        elif self.pos < 66:
-            difficulty = "medium"
-        else:
-            difficulty = "hard"
-
         # minigame_class = random.choice(self.minigames)
-        minigame_class = self.minigames[self.mini_count]
+        name = self.minigames[self.mini_count]
+        minigame_class = minigames.load(name)
         self.mini_count = (self.mini_count + 1) % len(self.minigames)
-        minigame = minigame_class(
-            difficulty, self.screen, self.clock, self.font, self.w, self.h, self.fps
-        )
 
-        return minigame.play_minigame()
+        # timers, key repeat, sprites and sounds of the minigame end with it
+        with lifecycle.Scope(name):
+            minigame = minigame_class(
+                difficulty, self.screen, self.clock, self.font, self.w, self.h, self.fps
+            )
+            return minigame.play_minigame()
 
-    def play_turn(self, backwards=False):
+    def play_turn(self):
         """Turn logic
 
-        Parameters
-        ----------
-        backwards : bool, optional
-            Whether the roll should make the player go backwards, by default False
-
         Returns
         -------
         bool
             True if the player has won the game, else False
         """
-        p = self.turn  # assign turn to p, just makes things easier to read
-
-        self.wait_for_click()  # wait for player to press roll
-        n = self.roll()
-        if backwards:
-            n = -n
-        self.prompt = f"P{p + 1} rolled a {n}"
-        self.move(n)
-
-        if self.pos >= 99:  # they've won the game
-            return True
-
-        # determines if current square is snake/ladder/special
-        square = self.board.get_square(self.pos)
-
-        # check if we landed on an action square (square will be None if it's
-        # a normal square and not a snake/ladder/special square)
-        if square is not None:
-            if square == self.board.SNAKE_SQUARE:
-                self.snake()
-            elif square == self.board.LADDER_SQUARE:
-                self.ladder()
-            elif square == self.board.SPECIAL_SQUARE:
-                self.prompt = (
-                    f"P{self.p + 1} landed on a special square! Play a minigame."
-                )
-                self.draw_board("Play Minigame")
-                self.draw_players()
-                pygame.display.update()
-                self.wait_for_click()
-
-                minigame_won = self.play_minigame()
-                if minigame_won:
-                    self.prompt = f"P{self.p + 1} won the minigame and get's to roll again to go forwards"
-                else:
-                    self.prompt = f"P{self.p + 1} lost the minigame and has to roll again to go backwards"
-
-                self.draw_board()
-                self.draw_players()
-                pygame.display.update()
-                return self.play_turn(backwards=not minigame_won)
-
-        return False
+        return self.engine.play_turn()
 
     def play_game(self):
         """Main game loop"""
@@ -442,98 +545,10 @@ class Game:
                 pygame.display.update()
                 pygame.time.wait(2000)
                 return
-            self.turn = (self.turn + 1) % len(self.players)
+            self.engine.next_turn()
 
             # draw
             self.prompt += f", P{(self.turn % len(self.players)) + 1}'s turn"
             self.draw_board()
             self.draw_players()
             pygame.display.update()
-
-
-class Board:
-    SNAKE_SQUARE = 0
-    LADDER_SQUARE = 1
-    SPECIAL_SQUARE = 2
-
-    def __init__(
-        self,
-        snakes={96: 77, 94: 55, 87: 23, 61: 17, 47: 25, 35: 5, 31: 9},
-        ladders={1: 37, 3: 13, 7: 29, 27: 73, 20: 41, 49: 66, 70: 91, 79: 98},
-        nspecial=5,
-    ):
-        """Game board
-
-        The board contains positions from 0 (start, bottom left) to 99 (end, top left)
-
-        Parameters
-        ----------
-        snakes : dict, optional
-            Head positions -> tail positions
-        ladders : dict, optional
-            Bottom bottom -> top position
-        nspecial : int, optional
-            Number of special squares to generate, by default 5
-        """
-        for k, v in snakes.items():
-            assert 0 < k < 99 and 0 < v < 99
-
-        for k, v in ladders.items():
-            assert 0 < k < 99 and 0 < v < 99
-
-        assert len(snakes) < 10 and len(ladders) < 10 and nspecial < 10
-
-        self.snakes = snakes
-        self.ladders = ladders
-
-        # generate nspecial random positions for the special squares
-        # don't include square 0 or square 99 or squares used by snakes/ladders
-        used_squares = (
-            set(self.snakes.keys())
-            | set(self.ladders.keys())
-            | set(self.snakes.values())
-            | set(self.ladders.values())
-        )
-        unused_squares = set(range(1, 99)) - used_squares
-        self.special = random.sample(unused_squares, nspecial)
-
-    def get_coord(self, pos):
-        """Get row and col of a give position
-
-        Row 0 is bottom-most, column 0 is left-most
-
-        Parameters
-        ----------
-        pos : int
-            Position
-
-        Returns
-        -------
-        int, int
-            Row and column
-        """
-        row = pos // 10
-        col = pos % 10 if row % 2 == 0 else (9 - pos % 10)
-        return row, col
-
-    def get_square(self, pos):
-        """Get type of square at a given position (None if it is "normal")
-
-        Parameters
-        ----------
-        pos : int
-            Position
-
-        Returns
-        -------
-        int or None
-            Type of square at pos
-        """
-        if pos in self.snakes:
-            return self.SNAKE_SQUARE
-        elif pos in self.ladders:
-            return self.LADDER_SQUARE
-        elif pos in self.special:
-            return self.SPECIAL_SQUARE
-        else:
-            return None
@@ -0,0 +1,230 @@
+"""Board layout generator
+
+Searches snake/ladder layouts whose exact figures (see analysis.BoardAnalysis) are
+close to a set of targets. Independent searches run in parallel across a process
+pool, and the layouts they find can be passed straight to Board.
+
+Requires NumPy (see requirements-dev.txt).
+
+Usage: python generator.py [number of layouts] [seed] [workers]
+"""
+import os
+import random
+import sys
+from multiprocessing import Pool
+
+import numpy as np
+
+from analysis import BoardAnalysis
+from board import Board
+
+# figures of analysis.BoardAnalysis.summary to aim for and how much each counts
+TARGETS = {"expected_turns": 30.0, "turns_std": 12.0, "minigames_per_turn": 0.25}
+WEIGHTS = {"expected_turns": 1.0, "turns_std": 0.5, "minigames_per_turn": 1.0}
+
+
+def is_valid(snakes, ladders, nspecial):
+    """Check that a layout is accepted by Board and has no overlapping squares"""
+    ends = [*snakes, *snakes.values(), *ladders, *ladders.values()]
+    return (
+        all(0 < pos < 99 for pos in ends)
+        and len(set(ends)) == len(ends)
+        and all(head > tail for head, tail in snakes.items())
+        and all(bottom < top for bottom, top in ladders.items())
+        and len(snakes) < 10
+        and len(ladders) < 10
+        and nspecial < 10
+    )
+
+
+def evaluate(snakes, ladders, nspecial, win_prob=0.5, samples=4, seed=0):
+    """Get the figures of a layout, averaged over special square placements
+
+    Parameters
+    ----------
+    snakes : dict
+        Head positions -> tail positions
+    ladders : dict
+        Bottom positions -> top positions
+    nspecial : int
+        Number of special squares
+    win_prob : float or dict, optional
+        Probability of winning a minigame, by default 0.5
+    samples : int, optional
+        Number of random special square placements to average, by default 4
+    seed : int, optional
+        Seed of the special square placements, by default 0
+
+    Returns
+    -------
+    dict
+        Expected turns, their standard deviation and minigames per turn
+    """
+    state = random.getstate()
+    random.seed(seed)
+    try:
+        boards = [Board(snakes, ladders, nspecial) for _ in range(samples)]
+    finally:
+        random.setstate(state)
+
+    figures = {"expected_turns": 0.0, "turns_std": 0.0, "minigames_per_turn": 0.0}
+    for board in boards:
+        analysis = BoardAnalysis(board, win_prob)
+        turns = analysis.expected_turns()
+        figures["expected_turns"] += turns / samples
+        figures["turns_std"] += np.sqrt(analysis.turns_variance()) / samples
+        figures["minigames_per_turn"] += analysis.expected_minigames() / turns / samples
+    return figures
+
+
+def score(figures, targets=TARGETS, weights=WEIGHTS):
+    """Weighted squared relative error of figures from their targets (lower is better)"""
+    return sum(
+        weights[key] * ((figures[key] - target) / target) ** 2
+        for key, target in targets.items()
+    )
+
+
+def random_layout(rng):
+    """Generate a random valid layout
+
+    Parameters
+    ----------
+    rng : random.Random
+        Random number generator
+
+    Returns
+    -------
+    dict, dict, int
+        Snakes, ladders and number of special squares
+    """
+    while True:
+        snakes, ladders = {}, {}
+        for _ in range(rng.randint(4, 9)):
+            head, tail = sorted(rng.sample(range(1, 99), 2), reverse=True)
+            snakes[head] = tail
+        for _ in range(rng.randint(4, 9)):
+            bottom, top = sorted(rng.sample(range(1, 99), 2))
+            ladders[bottom] = top
+        nspecial = rng.randint(3, 9)
+        if is_valid(snakes, ladders, nspecial):
+            return snakes, ladders, nspecial
+
+
+def mutate(snakes, ladders, nspecial, rng):
+    """Get a valid neighbouring layout
+
+    Moves one end of a snake or ladder, adds or removes a snake or ladder, or
+    changes the number of special squares.
+    """
+    while True:
+        new_snakes, new_ladders, new_nspecial = dict(snakes), dict(ladders), nspecial
+        pairs = new_snakes if rng.random() < 0.5 else new_ladders
+        move = rng.random()
+        if move < 0.6 and pairs:
+            start = rng.choice(list(pairs))
+            end = pairs.pop(start)
+            if rng.random() < 0.5:
+                start += rng.randint(-10, 10)
+            else:
+                end += rng.randint(-10, 10)
+            pairs[start] = end
+        elif move < 0.75:
+            a, b = rng.sample(range(1, 99), 2)
+            if pairs is new_snakes:
+                pairs[max(a, b)] = min(a, b)
+            else:
+                pairs[min(a, b)] = max(a, b)
+        elif move < 0.9 and pairs:
+            del pairs[rng.choice(list(pairs))]
+        else:
+            new_nspecial = min(max(nspecial + rng.choice((-1, 1)), 0), 9)
+        if is_valid(new_snakes, new_ladders, new_nspecial):
+            return new_snakes, new_ladders, new_nspecial
+
+
+def search(seed, steps=2000, win_prob=0.5, targets=TARGETS, weights=WEIGHTS, keep=5):
+    """Simulated annealing search for layouts close to the targets
+
+    Parameters
+    ----------
+    seed : int
+        Seed of the search
+    steps : int, optional
+        Number of candidate layouts to evaluate, by default 2000
+    win_prob : float or dict, optional
+        Probability of winning a minigame, by default 0.5
+    targets : dict, optional
+        Figure -> target value, by default TARGETS
+    weights : dict, optional
+        Figure -> weight in the score, by default WEIGHTS
+    keep : int, optional
+        Number of best layouts to return, by default 5
+
+    Returns
+    -------
+    list of (float, dict, dict, int, dict)
+        Score, snakes, ladders, number of special squares and figures of the
+        best layouts found, best first
+    """
+    rng = random.Random(seed)
+
+    def candidate(layout):
+        figures = evaluate(*layout, win_prob=win_prob, seed=seed)
+        return (score(figures, targets, weights), *layout, figures)
+
+    current = candidate(random_layout(rng))
+    best = [current]
+    for step in range(steps):
+        temperature = 0.05 * (1 - step / steps) + 1e-6
+        new = candidate(mutate(*current[1:4], rng))
+        if new[0] < current[0] or rng.random() < np.exp((current[0] - new[0]) / temperature):
+            current = new
+            best = sorted(best + [new], key=lambda item: item[0])[:keep]
+    return best
+
+
+def generate(num_layouts=10, seed=0, workers=None, steps=2000, win_prob=0.5, targets=TARGETS, weights=WEIGHTS):
+    """Run independent searches in parallel and collect the best layouts
+
+    Parameters
+    ----------
+    num_layouts : int, optional
+        Number of layouts to return (one search per layout), by default 10
+    seed : int, optional
+        Master seed, by default 0
+    workers : int, optional
+        Number of worker processes, by default one per core
+    steps, win_prob, targets, weights
+        See search
+
+    Returns
+    -------
+    list of (float, dict, dict, int, dict)
+        Best layout of each search (see search), best first
+    """
+    seeds = [seed * 1000003 + i for i in range(num_layouts)]
+    tasks = [(s, steps, win_prob, targets, weights, 1) for s in seeds]
+
+    if workers is None:
+        workers = os.cpu_count() or 1
+    if workers > 1 and len(tasks) > 1:
+        with Pool(min(workers, len(tasks))) as pool:
+            results = pool.starmap(search, tasks)
+    else:
+        results = [search(*task) for task in tasks]
+
+    return sorted((result[0] for result in results), key=lambda item: item[0])
+
+
+if __name__ == "__main__":
+    num_layouts = int(sys.argv[1]) if len(sys.argv) > 1 else 10
+    seed = int(sys.argv[2]) if len(sys.argv) > 2 else 0
+    workers = int(sys.argv[3]) if len(sys.argv) > 3 else None
+    for value, snakes, ladders, nspecial, figures in generate(num_layouts, seed, workers):
+        print(
+            f"# score {value:.4f}, {figures['expected_turns']:.2f} turns "
+            f"(std {figures['turns_std']:.2f}), "
+            f"{figures['minigames_per_turn']:.3f} minigames per turn"
+        )
+        print(f"Board({dict(sorted(snakes.items()))}, {dict(sorted(ladders.items()))}, {nspecial})")
@@ -2,7 +2,11 @@ import sys
 import time
 import random
 import pygame
-from pygame.locals import RLEACCEL
+import frame_stats
+import lifecycle
+from asset_manager import assets
+from pacing import FramePacer
+from text import render_text
 
 # constants
 rich_black = (26, 27, 41)
@@ -11,55 +15,106 @@ orange = (237, 125, 58)
 sky_blue = (135, 206, 250)
 
 
+class SpritePool:
+    def __init__(self, sprite_class):
+        """Reuses sprites that fell off the screen instead of creating new ones
+
+        Pooled sprites get a reset method taking the constructor's arguments,
+        which only moves them back to the top and sets their speed, and go back
+        to the pool through release when they leave the screen.
+
+        Parameters
+        ----------
+        sprite_class : type
+            Class of the pooled sprites
+        """
+        self.sprite_class = sprite_class
+        self.free = []
+
+    def acquire(self, *args):
+        """Get a sprite, reset with args if it is reused"""
+        if self.free:
+            sprite = self.free.pop()
+            sprite.reset(*args)
+        else:
+            sprite = self.sprite_class(*args)
+            sprite.pool = self
+        return sprite
+
+    def release(self, sprite):
+        """Remove a sprite from its groups and keep it for reuse"""
+        sprite.kill()
+        self.free.append(sprite)
+
+    def prefill(self, n, *args):
+        """Create n sprites ahead of time so the first spawns don't allocate"""
+        for _ in range(n):
+            sprite = self.sprite_class(*args)
+            sprite.pool = self
+            self.free.append(sprite)
+
+
 class Cloud(pygame.sprite.Sprite):
     def __init__(self, w, h, speed, size):
         super().__init__()
-        surf = pygame.image.load("assets/ladder_climb/cloud.png").convert_alpha()
+        self.pool = None
+        surf = assets.image("assets/ladder_climb/cloud.png")
         ratio = size / surf.get_height()
         sw, sh = int(ratio*surf.get_width()), int(ratio*surf.get_height())
-        self.surf = pygame.transform.scale(surf, (sw, sh))
-        self.surf.set_colorkey(sky_blue, RLEACCEL)
+        self.surf = assets.scaled("assets/ladder_climb/cloud.png", (sw, sh), colorkey=sky_blue)
+
+        self.rect = self.surf.get_rect()
+        self.reset(w, h, speed, size)
 
+    def reset(self, w, h, speed, size):
+        sw, sh = self.rect.size
         if random.random() < 0.5:
             xpos = random.randint(0, w//4)
         else:
             xpos = random.randint(3*w//4 - sw, w - sw)
 
-        self.rect = self.surf.get_rect(topleft=(xpos, -sh))
+        self.rect.topleft = (xpos, -sh)
         self.h = h
         self.speed = speed
 
     def update(self):
         self.rect.move_ip(0, self.speed)
         if self.rect.top >= self.h:
-            self.kill()
+            if self.pool is not None:
+                self.pool.release(self)
+            else:
+                self.kill()
 
 class FallingSnake(pygame.sprite.Sprite):
     def __init__(self, x, h, speed, size):
         super().__init__()
+        self.pool = None
+        self.surf = assets.scaled("assets/ladder_climb/falling_snake.png", (size - 2, size), colorkey=sky_blue)
+
+        self.rect = self.surf.get_rect()
+        self.reset(x, h, speed, size)
+
+    def reset(self, x, h, speed, size):
         self.x = x
         self.h = h
         self.speed = speed
         self.size = size
 
-        surf = pygame.image.load("assets/ladder_climb/falling_snake.png").convert_alpha()
-        self.surf = pygame.transform.scale(surf, (size - 2, size))
-        self.surf.set_colorkey(sky_blue, RLEACCEL)
-
-        self.rect = self.surf.get_rect(topleft=(x + 1, -size))
+        self.rect.topleft = (x + 1, -size)
 
     def update(self):
         self.rect.move_ip(0, self.speed)
         if self.rect.top >= self.h:
-            self.kill()
+            if self.pool is not None:
+                self.pool.release(self)
+            else:
+                self.kill()
 
 
 class Player(pygame.sprite.Sprite):
     def __init__(self, x, y, size, ladder_positions):
         super().__init__()
-        surf = pygame.image.load("assets/ladder_climb/player.png").convert_alpha()
-        self.surf = pygame.transform.scale(surf, (size - 2, size))
-        self.surf.set_colorkey(sky_blue, RLEACCEL)
+        self.surf = assets.scaled("assets/ladder_climb/player.png", (size - 2, size), colorkey=sky_blue)
 
         self.pos = 0
         self.ladder_positions = ladder_positions
@@ -96,8 +151,8 @@ class LadderClimb:
             pygame.Rect(cx + 1 * hw, 0, self.lad_w, self.h),
         ]
 
-        self.snakes = pygame.sprite.Group()
-        self.clouds = pygame.sprite.Group()
+        self.snakes = lifecycle.track_group(pygame.sprite.Group())
+        self.clouds = lifecycle.track_group(pygame.sprite.Group())
         self.player = Player(
             self.ladder_rects[0].left,
             self.h - 2 * self.lad_w,
@@ -119,8 +174,14 @@ class LadderClimb:
             self.speed = int(6 * fps/60)
             self.time_to_beat = 30
 
-        pygame.time.set_timer(self.NEW_CLOUD, 500)
-        pygame.time.set_timer(self.NEW_SNAKE, 50)
+        # clouds and snakes are reused as they fall off the screen
+        self.cloud_pool = SpritePool(Cloud)
+        self.cloud_pool.prefill(8, self.w, self.h, self.speed, self.lad_w)
+        self.snake_pool = SpritePool(FallingSnake)
+        self.snake_pool.prefill(16, self.ladder_rects[0].left, self.h, self.speed, self.lad_w)
+
+        lifecycle.set_timer(self.NEW_CLOUD, 500)
+        lifecycle.set_timer(self.NEW_SNAKE, 50)
 
         self.new_snake_allowed = True
 
@@ -147,11 +208,11 @@ class LadderClimb:
             elif key == pygame.K_RIGHT:
                 self.player.move_right()
         elif event.type == self.NEW_CLOUD:
-            self.clouds.add(Cloud(self.w, self.h, self.speed, self.lad_w))
+            self.clouds.add(self.cloud_pool.acquire(self.w, self.h, self.speed, self.lad_w))
         elif self.new_snake_allowed and event.type == self.NEW_SNAKE and random.random() < self.prob:
             pos = random.randint(0, len(self.ladder_rects) - 1)
             x = self.ladder_rects[pos].left
-            self.snakes.add(FallingSnake(x, self.h, self.speed, self.lad_w))
+            self.snakes.add(self.snake_pool.acquire(x, self.h, self.speed, self.lad_w))
 
         return False
 
@@ -180,18 +241,18 @@ class LadderClimb:
 
         # draw timer
         self.screen.blit(
-            self.font.render("Timer: " + str(int(self.time_to_beat - self.elapsed)), True, white),
+            render_text("Timer: " + str(int(self.time_to_beat - self.elapsed)), self.font, white),
             (20, 20),
         )
 
         # instructions
         self.screen.blit(
-            self.font.render("Avoid the snakes", True, white),
+            render_text("Avoid the snakes", self.font, white),
             (20, 40),
         )
 
         self.screen.blit(
-            self.font.render("Use the arrows keys to move left and right", True, white),
+            render_text("Use the arrows keys to move left and right", self.font, white),
             (20, 60)
         )
 
@@ -201,11 +262,14 @@ class LadderClimb:
         pygame.display.update()
         self.start_time = time.time()
         start = self.start_time
+        stats = frame_stats.begin("ladder_climb", self.fps)
+        pacer = FramePacer(self.clock, self.fps, stats=stats)
         while True:
+            stats.frame()
             if self.tick_event():
                 pygame.draw.rect(self.screen, rich_black, pygame.Rect(0, 0, 500, 100))
                 self.screen.blit(
-                    self.font.render("YOU LOST!", True, white),
+                    render_text("YOU LOST!", self.font, white),
                     (20, 40),
                 )
                 pygame.display.update()
@@ -214,12 +278,13 @@ class LadderClimb:
 
             for event in pygame.event.get():
                 self.handle_event(event)
+            stats.mark("events")
 
             self.elapsed = time.time() - start
             if self.elapsed > self.time_to_beat:
                 pygame.draw.rect(self.screen, rich_black, pygame.Rect(0, 0, 500, 100))
                 self.screen.blit(
-                    self.font.render("YOU WON!", True, white),
+                    render_text("YOU WON!", self.font, white),
                     (20, 40),
                 )
                 pygame.display.update()
@@ -229,11 +294,16 @@ class LadderClimb:
             self.clouds.update()
             self.snakes.update()
             self.player.update()
+            stats.mark("update")
 
-            self.clock.tick(self.fps)
+            pacer.tick()
+            stats.mark("tick")
 
             self.draw()
+            stats.draw_overlay(self.screen)
+            stats.mark("draw")
             pygame.display.update()
+            stats.mark("flip")
 
 
 if __name__ == "__main__":
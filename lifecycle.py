@@ -0,0 +1,192 @@
+"""Scoped timers, key repeat, sprite groups and sounds of the minigames
+
+Game plays every minigame inside a Scope, which is the active scope inside its
+with statement. Minigames arm timers and change the key repeat through this
+module instead of calling pygame directly, and register their sprite groups and
+sounds, so that everything is torn down when the minigame returns: timers are
+cancelled and their pending events dropped, the key repeat is restored, groups
+are emptied (breaking the sprite <-> group references) and sounds stopped.
+
+Outside of a scope (a minigame run on its own) the calls go straight to pygame.
+
+Closing a scope logs what it tore down, then checks that the teardown worked
+and builds a leak report of what survived it (timer events still queued, key
+repeat not restored, sprites still in groups, sounds or other mixer channels
+still playing). Set SNAKES_LEAK_REPORT=1 to print the leak report.
+"""
+import os
+
+import pygame
+
+REPORT = os.environ.get("SNAKES_LEAK_REPORT") == "1"
+
+
+class Scope:
+    def __init__(self, name):
+        """Resources of one minigame, torn down by close
+
+        Parameters
+        ----------
+        name : str
+            Name of the minigame
+        """
+        self.name = name
+        self.timers = {}  # event type -> ticks when a one-shot timer fires, None if repeating
+        self.cancelled = set()  # event types of timers cancelled before close, their events may be queued
+        self.repeat = None  # key repeat before the scope first changed it
+        self.groups = []
+        self.sounds = []
+        self.torn_down = []  # what close tore down
+        self.leaks = []  # what survived close
+        self.closed = False
+        self.parent = None
+
+    def set_timer(self, event, millis, once=False):
+        """Arm (or cancel, if millis is 0) a timer, see pygame.time.set_timer"""
+        event_type = event if isinstance(event, int) else event.type
+        if once:
+            pygame.time.set_timer(event, millis, True)
+        else:
+            pygame.time.set_timer(event, millis)
+        if millis:
+            self.timers[event_type] = pygame.time.get_ticks() + millis if once else None
+            self.cancelled.discard(event_type)
+        else:
+            if self.timers.pop(event_type, False) is not False:
+                self.cancelled.add(event_type)
+
+    def set_repeat(self, delay=0, interval=0):
+        """Change the key repeat, see pygame.key.set_repeat"""
+        if self.repeat is None:
+            self.repeat = pygame.key.get_repeat()
+        pygame.key.set_repeat(delay, interval)
+
+    def add_group(self, group):
+        """Register a sprite group to empty on close and return it"""
+        self.groups.append(group)
+        return group
+
+    def add_sound(self, sound):
+        """Register a sound to stop on close and return it"""
+        self.sounds.append(sound)
+        return sound
+
+    def close(self):
+        """Tear down every resource of the scope and build its leak report
+
+        Returns
+        -------
+        list of str
+            Description of everything that survived the teardown (the
+            teardown itself is logged in torn_down)
+        """
+        if self.closed:
+            return self.leaks
+        self.closed = True
+        torn_down = []
+        now = pygame.time.get_ticks()
+
+        # tear down
+        for event_type, fires in self.timers.items():
+            if fires is None or fires > now:
+                torn_down.append(f"cancelled timer {pygame.event.event_name(event_type)} ({event_type})")
+            pygame.time.set_timer(event_type, 0)
+        event_types = [*self.timers, *self.cancelled]
+        if event_types and pygame.display.get_init():
+            queued = pygame.event.get(event_types)
+            if queued:
+                torn_down.append(f"dropped {len(queued)} queued timer events")
+
+        if self.repeat is not None and pygame.key.get_repeat() != self.repeat:
+            torn_down.append(f"restored key repeat {self.repeat} from {pygame.key.get_repeat()}")
+            pygame.key.set_repeat(*self.repeat)
+
+        for group in self.groups:
+            if group:
+                torn_down.append(f"emptied a group of {len(group)} sprites")
+            group.empty()
+
+        if pygame.mixer.get_init():
+            for sound in self.sounds:
+                if sound.get_num_channels():
+                    torn_down.append(f"stopped a sound playing on {sound.get_num_channels()} channels")
+                sound.stop()
+
+        # check what survived
+        leaks = []
+        if event_types and pygame.display.get_init():
+            queued = pygame.event.peek(event_types)
+            if queued:
+                leaks.append("timer events still queued")
+        if self.repeat is not None and pygame.key.get_repeat() != self.repeat:
+            leaks.append(f"key repeat {pygame.key.get_repeat()} instead of {self.repeat}")
+        for group in self.groups:
+            if group:
+                leaks.append(f"group still holds {len(group)} sprites")
+        if pygame.mixer.get_init():
+            busy = [
+                i
+                for i in range(pygame.mixer.get_num_channels())
+                if pygame.mixer.Channel(i).get_busy()
+            ]
+            if busy:
+                leaks.append(f"mixer channels {busy} still busy")
+
+        self.torn_down = torn_down
+        self.leaks = reports[self.name] = leaks
+        if REPORT and leaks:
+            print(f"{self.name} left behind:")
+            for leak in leaks:
+                print("  " + leak)
+        return leaks
+
+    def __enter__(self):
+        global active
+        self.parent = active
+        active = self
+        return self
+
+    def __exit__(self, *exc_info):
+        global active
+        active = self.parent
+        self.close()
+        return False
+
+
+# scope of the minigame being played, None outside of minigames
+active = None
+
+# minigame name -> leak report of its last closed scope
+reports = {}
+
+
+def set_timer(event, millis, once=False):
+    """Arm a timer in the active scope (see Scope.set_timer)"""
+    if active is not None:
+        active.set_timer(event, millis, once)
+    elif once:
+        pygame.time.set_timer(event, millis, True)
+    else:
+        pygame.time.set_timer(event, millis)
+
+
+def set_repeat(delay=0, interval=0):
+    """Change the key repeat in the active scope (see Scope.set_repeat)"""
+    if active is not None:
+        active.set_repeat(delay, interval)
+    else:
+        pygame.key.set_repeat(delay, interval)
+
+
+def track_group(group):
+    """Register a sprite group in the active scope and return it"""
+    if active is not None:
+        active.add_group(group)
+    return group
+
+
+def track_sound(sound):
+    """Register a sound in the active scope and return it"""
+    if active is not None:
+        active.add_sound(sound)
+    return sound
@@ -0,0 +1,42 @@
+"""Registry of the minigames
+
+A minigame's module is only imported the first time the minigame is played, so
+importing the game doesn't pay for (or run) every minigame module up front.
+"""
+import importlib
+import sys
+import time
+
+from startup_trace import tracer
+
+# minigame name -> module and class implementing it
+MINIGAMES = {
+    "simon_says": ("simon_says", "SimonSays"),
+    "ladder_climb": ("ladder_climb", "LadderClimb"),
+    "snake_charmer": ("snake_charmer", "SnakeCharmer"),
+    "tile_memory": ("tile_memory", "TileMemory"),
+    "snake_game": ("snake_game", "SnakeGame"),
+}
+
+def load(name):
+    """Get the class of a minigame, importing its module if needed
+
+    Parameters
+    ----------
+    name : str
+        Name of the minigame (a key of MINIGAMES)
+
+    Returns
+    -------
+    type
+        Minigame class, constructed as
+        cls(difficulty, screen, clock, font, w, h, fps)
+    """
+    module_name, class_name = MINIGAMES[name]
+    module = sys.modules.get(module_name)
+    if module is None:
+        start = time.perf_counter_ns()
+        module = importlib.import_module(module_name)
+        # reported by the startup tracer when SNAKES_STARTUP_TRACE is set
+        tracer.lazy_import(module_name, time.perf_counter_ns() - start)
+    return getattr(module, class_name)
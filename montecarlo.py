@@ -0,0 +1,151 @@
+"""Multi-process Monte Carlo statistics of a board
+
+Splits the games into fixed-size chunks, simulates the chunks with
+batchsim.simulate across a process pool and merges their histograms. Every chunk
+gets its own random stream spawned from one master seed, so the report only
+depends on the seed and the chunk size, never on the number of workers.
+
+Requires NumPy (see requirements-dev.txt).
+
+Usage: python montecarlo.py [number of games] [seed] [workers]
+"""
+import os
+import random
+import sys
+import time
+from multiprocessing import Pool
+
+import numpy as np
+
+from batchsim import simulate
+from board import Board, LAYOUTS
+
+
+class Report:
+    def __init__(self, num_players):
+        """Merged histograms of simulated games
+
+        Parameters
+        ----------
+        num_players : int
+            Number of players in each game
+        """
+        self.num_players = num_players
+        self.games = 0
+        self.turns = np.zeros(1, dtype=np.int64)  # games by number of turns
+        self.wins = np.zeros(num_players, dtype=np.int64)  # wins by turn order
+        self.snake_hits = np.zeros(100, dtype=np.int64)  # landings by position
+        self.ladder_hits = np.zeros(100, dtype=np.int64)  # landings by position
+
+    def add(self, result):
+        """Merge a batchsim.BatchResult into the report"""
+        self.games += len(result.winners)
+        self.merge_turns(result.turn_histogram())
+        finished = result.winners[result.winners >= 0]
+        self.wins += np.bincount(finished, minlength=self.num_players)
+        self.snake_hits += result.snake_hits
+        self.ladder_hits += result.ladder_hits
+
+    def merge(self, other):
+        """Merge another Report into the report"""
+        self.games += other.games
+        self.merge_turns(other.turns)
+        self.wins += other.wins
+        self.snake_hits += other.snake_hits
+        self.ladder_hits += other.ladder_hits
+
+    def merge_turns(self, turns):
+        if len(turns) > len(self.turns):
+            self.turns = np.pad(self.turns, (0, len(turns) - len(self.turns)))
+        self.turns[: len(turns)] += turns
+
+    def win_share(self):
+        """Fraction of the games won by each player in turn order"""
+        return self.wins / self.games
+
+    def mean_turns(self):
+        """Mean number of turns of a game"""
+        return (self.turns * np.arange(len(self.turns))).sum() / self.games
+
+    def percentile(self, q):
+        """Number of turns that q percent of the games finish within"""
+        return int(np.searchsorted(np.cumsum(self.turns), q / 100 * self.games))
+
+
+def run_chunk(board, num_games, num_players, win_prob, seed):
+    """Simulate one chunk of games (runs in a worker process)"""
+    result = simulate(board, num_games, num_players, win_prob, np.random.default_rng(seed))
+    report = Report(num_players)
+    report.add(result)
+    return report
+
+
+def run(board, num_games, num_players=2, win_prob=0.5, seed=0, workers=None, chunk_size=100000):
+    """Simulate games of a board across a process pool
+
+    Parameters
+    ----------
+    board : Board
+        Board to play on
+    num_games : int
+        Number of games to play
+    num_players : int, optional
+        Number of players in each game, by default 2
+    win_prob : float or dict, optional
+        Probability of winning a minigame, either for every difficulty or as a
+        dict of difficulty -> probability, by default 0.5
+    seed : int, optional
+        Master seed of every chunk's random stream, by default 0
+    workers : int, optional
+        Number of worker processes, by default one per core
+    chunk_size : int, optional
+        Number of games per chunk, by default 100000
+
+    Returns
+    -------
+    Report
+        Merged histograms of all the games
+    """
+    sizes = [chunk_size] * (num_games // chunk_size)
+    if num_games % chunk_size:
+        sizes.append(num_games % chunk_size)
+    seeds = np.random.SeedSequence(seed).spawn(len(sizes))
+    tasks = [
+        (board, size, num_players, win_prob, chunk_seed)
+        for size, chunk_seed in zip(sizes, seeds)
+    ]
+
+    if workers is None:
+        workers = os.cpu_count() or 1
+    if workers > 1 and len(tasks) > 1:
+        with Pool(min(workers, len(tasks))) as pool:
+            reports = pool.starmap(run_chunk, tasks)
+    else:
+        reports = [run_chunk(*task) for task in tasks]
+
+    report = Report(num_players)
+    for chunk in reports:
+        report.merge(chunk)
+    return report
+
+
+if __name__ == "__main__":
+    num_games = int(sys.argv[1]) if len(sys.argv) > 1 else 10000000
+    seed = int(sys.argv[2]) if len(sys.argv) > 2 else 0
+    workers = int(sys.argv[3]) if len(sys.argv) > 3 else None
+    random.seed(seed)  # special squares
+    for name, *layout in LAYOUTS:
+        board = Board(*layout)
+        start = time.perf_counter()
+        report = run(board, num_games, seed=seed, workers=workers)
+        elapsed = time.perf_counter() - start
+        print(
+            f"{name}: {report.games} games in {elapsed:.2f}s, "
+            f"{report.mean_turns():.2f} turns on average "
+            f"(p50 {report.percentile(50)}, p99 {report.percentile(99)}), "
+            f"win share {np.round(report.win_share(), 3)}"
+        )
+        snakes = {pos: int(report.snake_hits[pos]) for pos in board.snakes}
+        ladders = {pos: int(report.ladder_hits[pos]) for pos in board.ladders}
+        print(f"  snake hits {snakes}")
+        print(f"  ladder hits {ladders}")
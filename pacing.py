@@ -0,0 +1,76 @@
+"""Frame pacing of the game loops
+
+A FramePacer caps the frame rate of a loop and, in on-demand mode, sleeps until
+there is input (or a timer event) instead of redrawing a screen that hasn't
+changed. Every game loop ticks through a FramePacer (with on-demand mode off for
+loops that animate), so SNAKES_MAX_FPS caps the frame rate of the whole game.
+"""
+import os
+
+import pygame
+
+MAX_FPS = int(os.environ.get("SNAKES_MAX_FPS", 0))  # 0 means no global cap
+
+
+class FramePacer:
+    def __init__(self, clock, fps, on_demand=False, idle_timeout=0, stats=None):
+        """Paces the frames of a loop
+
+        Parameters
+        ----------
+        clock : pygame.time.Clock
+            Clock of the loop
+        fps : int
+            Maximum frames per second (lowered to SNAKES_MAX_FPS if it is set)
+        on_demand : bool, optional
+            Sleep in events() until an event arrives, unless a redraw was
+            requested, by default False
+        idle_timeout : int, optional
+            Longest time in milliseconds to sleep waiting for an event in
+            on-demand mode, by default 0 (until there is an event)
+        stats : frame_stats.FrameStats, optional
+            Stats of the loop, the time spent asleep isn't counted in its frame
+            times, by default None
+        """
+        self.clock = clock
+        self.fps = min(fps, MAX_FPS) if MAX_FPS else fps
+        self.on_demand = on_demand
+        self.idle_timeout = idle_timeout
+        self.stats = stats
+        self.redraw = True  # the first frame is always drawn
+
+    def request_redraw(self):
+        """Draw another frame even if no event arrives"""
+        self.redraw = True
+
+    def events(self):
+        """Get the pending events
+
+        In on-demand mode this sleeps until an event arrives if no redraw was
+        requested since the last call.
+
+        Returns
+        -------
+        list of pygame.event.Event
+            Events in the queue
+        """
+        if not self.on_demand or self.redraw:
+            self.redraw = False
+            return pygame.event.get()
+
+        event = pygame.event.wait(self.idle_timeout)
+        if self.stats is not None:
+            self.stats.resume_frame()
+        if event.type == pygame.NOEVENT:
+            return pygame.event.get()
+        return [event] + pygame.event.get()
+
+    def tick(self):
+        """End the frame, waiting as needed to stay under the frame rate cap
+
+        Returns
+        -------
+        int
+            Milliseconds since the previous tick
+        """
+        return self.clock.tick(self.fps)
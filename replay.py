@@ -0,0 +1,337 @@
+"""Recording and deterministic replay of play sessions
+
+A recording holds the seed of the random module, the result of every call to
+pygame.event.get, pygame.event.wait and pygame.event.poll made during a session
+(with the time between calls) and the value of every call to
+pygame.time.get_ticks and time.time. Replaying it seeds the random module the
+same way and answers those calls from the recording instead of the real event
+queue and clocks, each kind of call from its own stream in the recorded order,
+so board turns and minigames are played exactly as they were recorded.
+
+While replaying, pygame.mouse.get_pos follows the positions of the replayed
+events, so time limits and hovers behave the same whether the replay runs at the
+original speed or unthrottled (clock ticks and waits return immediately).
+
+Record a session with
+
+    SNAKES_RECORD=session.jsonl.gz python main.py
+
+and replay it with
+
+    python replay.py session.jsonl.gz [--unthrottled]
+"""
+import atexit
+import gzip
+import json
+import os
+import random
+import sys
+import time
+
+import pygame
+
+FORMAT_VERSION = 2
+
+# kinds of recorded calls
+EVENTS = "e"  # event get/wait/poll: ["e", milliseconds since the previous one(, [events])]
+TICKS = "t"  # pygame.time.get_ticks: ["t", value]
+TIME = "s"  # time.time: ["s", value]
+
+
+def encode_event(event):
+    """Get a JSON friendly [type, attributes] list of an event"""
+    attributes = {
+        key: list(value) if isinstance(value, tuple) else value
+        for key, value in event.dict.items()
+        if isinstance(value, (int, float, str, bool, tuple, type(None)))
+    }
+    return [event.type, attributes]
+
+
+def decode_event(data):
+    """Get the event of an [type, attributes] list made by encode_event"""
+    event_type, attributes = data
+    attributes = {
+        key: tuple(value) if isinstance(value, list) else value
+        for key, value in attributes.items()
+    }
+    return pygame.event.Event(event_type, attributes)
+
+
+class Recorder:
+    def __init__(self, path, seed=None):
+        """Records the events and seed of a session to a gzipped JSON lines file
+
+        The first line is a header with the format version and seed, followed by
+        one line per recorded call, in call order (see EVENTS, TICKS and TIME).
+
+        Parameters
+        ----------
+        path : str
+            File to write the recording to
+        seed : int, optional
+            Seed of the random module, by default one based on the time
+        """
+        self.path = path
+        self.seed = time.time_ns() % 2 ** 32 if seed is None else seed
+        self.file = None
+        self.start = None
+        self.last = 0  # milliseconds since the start of the previous event call
+        self.calls = {EVENTS: 0, TICKS: 0, TIME: 0}
+        self.originals = {}
+
+    def install(self):
+        """Seed the random module and start recording the event calls"""
+        random.seed(self.seed)
+        self.file = gzip.open(self.path, "wt")
+        self.file.write(json.dumps({"version": FORMAT_VERSION, "seed": self.seed}) + "\n")
+        self.start = time.perf_counter()
+
+        self.originals = {
+            "get": pygame.event.get,
+            "wait": pygame.event.wait,
+            "poll": pygame.event.poll,
+            "get_ticks": pygame.time.get_ticks,
+            "time": time.time,
+        }
+        pygame.event.get = self.get
+        pygame.event.wait = self.wait
+        pygame.event.poll = self.poll
+        pygame.time.get_ticks = self.get_ticks
+        time.time = self.time
+        atexit.register(self.close)
+
+    def write(self, entry):
+        self.file.write(json.dumps(entry, separators=(",", ":")) + "\n")
+        self.calls[entry[0]] += 1
+
+    def record(self, events):
+        now = int((time.perf_counter() - self.start) * 1000)
+        entry = [EVENTS, now - self.last]
+        if events:
+            entry.append([encode_event(event) for event in events])
+        self.write(entry)
+        self.last = now
+
+    def get(self, *args, **kwargs):
+        events = self.originals["get"](*args, **kwargs)
+        self.record(events)
+        return events
+
+    def wait(self, *args, **kwargs):
+        event = self.originals["wait"](*args, **kwargs)
+        self.record([event] if event.type != pygame.NOEVENT else [])
+        return event
+
+    def poll(self):
+        event = self.originals["poll"]()
+        self.record([event] if event.type != pygame.NOEVENT else [])
+        return event
+
+    def get_ticks(self):
+        ticks = self.originals["get_ticks"]()
+        self.write([TICKS, ticks])
+        return ticks
+
+    def time(self):
+        now = self.originals["time"]()
+        self.write([TIME, now])
+        return now
+
+    def close(self):
+        """Stop recording and close the file"""
+        if self.file is None:
+            return
+        for name in ("get", "wait", "poll"):
+            setattr(pygame.event, name, self.originals[name])
+        pygame.time.get_ticks = self.originals["get_ticks"]
+        time.time = self.originals["time"]
+        self.file.close()
+        self.file = None
+
+
+class UnthrottledClock:
+    def __init__(self):
+        """Stand-in for pygame.time.Clock whose tick never waits"""
+        self.clock = Replayer.Clock()
+
+    def tick(self, framerate=0):
+        return self.clock.tick()
+
+    def tick_busy_loop(self, framerate=0):
+        return self.clock.tick()
+
+    def get_time(self):
+        return self.clock.get_time()
+
+    def get_rawtime(self):
+        return self.clock.get_rawtime()
+
+    def get_fps(self):
+        return self.clock.get_fps()
+
+
+class Replayer:
+    # pygame.time.Clock before it is replaced by UnthrottledClock
+    Clock = pygame.time.Clock
+
+    def __init__(self, path, throttle=True):
+        """Replays a session recorded by Recorder
+
+        Real events are discarded while replaying, except that closing the
+        window ends the replay. Once the recording runs out every event call
+        returns a QUIT event.
+
+        Parameters
+        ----------
+        path : str
+            File of the recording
+        throttle : bool, optional
+            Replay at the original speed, by default True (else as fast as
+            possible)
+        """
+        with gzip.open(path, "rt") as f:
+            header = json.loads(f.readline())
+            if header["version"] != FORMAT_VERSION:
+                raise ValueError(f"unsupported recording version {header['version']}")
+            # kind -> recorded calls of that kind, in order
+            self.calls = {EVENTS: [], TICKS: [], TIME: []}
+            for line in f:
+                entry = json.loads(line)
+                self.calls[entry[0]].append(entry[1:])
+
+        self.seed = header["seed"]
+        self.throttle = throttle
+        self.index = {EVENTS: 0, TICKS: 0, TIME: 0}  # kind -> next call to replay
+        self.now = 0  # recorded milliseconds of the last event call since the start
+        self.mouse = (0, 0)
+        self.start = None
+        self.finished = False
+        self.originals = {}
+
+    def install(self):
+        """Seed the random module and start answering the event calls"""
+        random.seed(self.seed)
+        self.start = time.perf_counter()
+
+        self.originals = {
+            "get": pygame.event.get,
+            "wait": pygame.event.wait,
+            "poll": pygame.event.poll,
+            "get_pos": pygame.mouse.get_pos,
+            "get_ticks": pygame.time.get_ticks,
+            "time": time.time,
+            "wait_ms": pygame.time.wait,
+            "delay": pygame.time.delay,
+            "Clock": pygame.time.Clock,
+        }
+        pygame.event.get = self.get
+        pygame.event.wait = self.wait
+        pygame.event.poll = self.poll
+        pygame.mouse.get_pos = self.get_mouse_pos
+        pygame.time.get_ticks = self.get_ticks
+        time.time = self.time
+        if not self.throttle:
+            pygame.time.wait = pygame.time.delay = lambda milliseconds: 0
+            pygame.time.Clock = UnthrottledClock
+        atexit.register(self.report)
+
+    def uninstall(self):
+        """Stop replaying and restore the patched functions"""
+        atexit.unregister(self.report)
+        for name in ("get", "wait", "poll"):
+            setattr(pygame.event, name, self.originals[name])
+        pygame.mouse.get_pos = self.originals["get_pos"]
+        pygame.time.get_ticks = self.originals["get_ticks"]
+        time.time = self.originals["time"]
+        pygame.time.wait = self.originals["wait_ms"]
+        pygame.time.delay = self.originals["delay"]
+        pygame.time.Clock = self.originals["Clock"]
+
+    def next_value(self, kind):
+        """Get the recorded value of the next call of a kind (the last value
+        once the calls of that kind run out)"""
+        calls = self.calls[kind]
+        index = self.index[kind]
+        if index >= len(calls):
+            return calls[-1][0] if calls else 0
+        self.index[kind] = index + 1
+        return calls[index][0]
+
+    def next(self):
+        """Get the events of the next recorded call"""
+        # drain the real queue, only closing the window is honoured
+        for event in self.originals["get"]():
+            if event.type == pygame.QUIT:
+                self.finished = True
+        calls = self.calls[EVENTS]
+        if self.finished or self.index[EVENTS] >= len(calls):
+            self.finished = True
+            return [pygame.event.Event(pygame.QUIT)]
+
+        entry = calls[self.index[EVENTS]]
+        self.index[EVENTS] += 1
+        self.now += entry[0]
+        if self.throttle:
+            delay = self.now / 1000 - (time.perf_counter() - self.start)
+            if delay > 0:
+                time.sleep(delay)
+
+        events = [decode_event(data) for data in entry[1]] if len(entry) > 1 else []
+        for event in events:
+            if hasattr(event, "pos"):
+                self.mouse = event.pos
+        return events
+
+    def get(self, *args, **kwargs):
+        return self.next()
+
+    def wait(self, *args, **kwargs):
+        events = self.next()
+        return events[0] if events else pygame.event.Event(pygame.NOEVENT)
+
+    def poll(self):
+        events = self.next()
+        return events[0] if events else pygame.event.Event(pygame.NOEVENT)
+
+    def get_mouse_pos(self):
+        return self.mouse
+
+    def get_ticks(self):
+        return self.next_value(TICKS)
+
+    def time(self):
+        return self.next_value(TIME)
+
+    def report(self):
+        """Print how much of the recording was replayed"""
+        print(
+            f"replayed {self.index[EVENTS]} of {len(self.calls[EVENTS])} recorded event calls, "
+            f"{self.index[TICKS]} of {len(self.calls[TICKS])} get_ticks calls, "
+            f"{self.index[TIME]} of {len(self.calls[TIME])} time calls"
+        )
+
+
+def record_from_env():
+    """Start recording the session to SNAKES_RECORD if it is set
+
+    Returns
+    -------
+    Recorder or None
+        Recorder of the session, None if not recording
+    """
+    path = os.environ.get("SNAKES_RECORD")
+    if not path:
+        return None
+    recorder = Recorder(path)
+    recorder.install()
+    return recorder
+
+
+if __name__ == "__main__":
+    os.environ.pop("SNAKES_RECORD", None)  # don't record the replay
+    Replayer(sys.argv[1], throttle="--unthrottled" not in sys.argv).install()
+
+    import main
+
+    main.main()
@@ -4,6 +4,11 @@ import os
 import time
 import random
 
+import frame_stats
+from pacing import FramePacer
+from asset_manager import assets
+from text import render_text, sys_font
+
 
 red = (255, 0, 0)
 green = (0, 255, 0)
@@ -46,7 +51,7 @@ class Button:
 
         if self.text != "":
 
-            text = self.font.render(self.text, 1, (0, 0, 0))
+            text = render_text(self.text, self.font, (0, 0, 0))
             self.screen.blit(
                 text,
                 (
@@ -73,13 +78,13 @@ class SimonSays:
         self.w, self.h = w, h
         self.fps = fps
 
-        background_image = pygame.image.load(os.path.join("images", "GAMEBACK.jpeg"))
-        self.backgroundResize = pygame.transform.scale(background_image, (1280, 720))
-
-        game_image = pygame.image.load(os.path.join("images", "GAMEBACK.jpeg"))
-        self.gameImageResize = pygame.transform.scale(game_image, (1280, 720))
+        # the start window and the game share the same background
+        self.backgroundResize = assets.scaled(
+            os.path.join("images", "GAMEBACK.jpeg"), (1280, 720), alpha=False
+        )
+        self.gameImageResize = self.backgroundResize
 
-        self.font = pygame.font.SysFont("comicsans", 25)
+        self.font = sys_font("comicsans", 25)
 
         if self.difficulty == "easy":
             grid_size = 3
@@ -120,21 +125,21 @@ class SimonSays:
         pygame.draw.rect(self.screen, (255, 255, 255), (60, 80, 640, 56))
 
         # The text
-        instructionsText1 = self.font.render(
+        instructionsText1 = render_text(
             "Welcome to Simon Says! You have to click the buttons in the ",
-            True,
+            self.font,
             (0, 0, 0),
         )
-        instructionsText2 = self.font.render(
-            "order they appear on the screen! Are you ready?", True, (0, 0, 0)
+        instructionsText2 = render_text(
+            "order they appear on the screen! Are you ready?", self.font, (0, 0, 0)
         )
 
         self.screen.blit(instructionsText1, (80, 90))
 
         self.screen.blit(instructionsText2, (80, 115))
 
-    def minigame(self):
-        # background
+    def draw_grid(self):
+        """Draw the background and the grid of tiles"""
         self.screen.fill(white)
         self.screen.blit(self.gameImageResize, (0, 0))
 
@@ -142,6 +147,14 @@ class SimonSays:
         for rect in self.rects:
             pygame.draw.rect(self.screen, red_crayola, rect)
 
+    def highlight(self, rect, colour):
+        """Draw a tile of the grid in a colour and show it"""
+        pygame.draw.rect(self.screen, colour, rect)
+        pygame.display.update()
+
+    def minigame(self):
+        self.draw_grid()
+
         # show tiles
         pygame.display.update()
         pygame.time.wait(3000)
@@ -150,16 +163,17 @@ class SimonSays:
         grey_rects = random.sample(self.rects, self.num_squares_to_click)
         for rect in grey_rects:
             # draw grey rect
-            pygame.draw.rect(self.screen, emerald, rect)
-            pygame.display.update()
+            self.highlight(rect, emerald)
             pygame.time.wait(self.time_to_see_square)
 
             # undraw grey rect
-            pygame.draw.rect(self.screen, red_crayola, rect)
-            pygame.display.update()
+            self.highlight(rect, red_crayola)
 
         cur_square = 0
+        stats = frame_stats.begin("simon_says", self.fps)
+        pacer = FramePacer(self.clock, self.fps, stats=stats)
         while True:
+            stats.frame()
             # exit the game if the user wants
             for event in pygame.event.get():
                 if event.type == pygame.QUIT:
@@ -173,19 +187,18 @@ class SimonSays:
                         if rect.collidepoint(pos):
                             if rect == grey_rects[cur_square]:
                                 cur_square += 1
-                                pygame.draw.rect(self.screen, blue, rect)
-                                pygame.display.update()
+                                self.highlight(rect, blue)
                                 pygame.time.wait(200)
-                                pygame.draw.rect(self.screen, red_crayola, rect)
-                                pygame.display.update()
+                                self.highlight(rect, red_crayola)
                                 if cur_square >= len(grey_rects):
                                     return True
                             else:
-                                pygame.draw.rect(self.screen, rich_black, rect)
-                                pygame.display.update()
+                                self.highlight(rect, rich_black)
                                 pygame.time.wait(500)
                                 return False
-            self.clock.tick(self.fps)
+            stats.mark("events")
+            pacer.tick()
+            stats.mark("tick")
 
     def play_minigame(self):
         """Return True if minigame is won, else False"""
@@ -210,9 +223,11 @@ class SimonSays:
         playbutton.draw((0, 0, 0))
         pygame.display.update()
 
+        # nothing changes until the button is clicked
+        pacer = FramePacer(self.clock, self.fps, on_demand=True)
         while True:
             # exit the game if the user wants
-            for event in pygame.event.get():
+            for event in pacer.events():
                 if event.type == pygame.QUIT:
                     pygame.quit()
                     sys.exit()
@@ -223,7 +238,7 @@ class SimonSays:
                     if playbutton.isOver(pos):
                         return self.minigame()
 
-            self.clock.tick(self.fps)
+            pacer.tick()
 
 
 if __name__ == "__main__":
@@ -1,8 +1,14 @@
-from pygame import draw
 from pygame.locals import *
 import pygame
+import os
 import sys
-import random
+import frame_stats
+import lifecycle
+import sounds
+import words
+from pacing import FramePacer
+from asset_manager import assets
+from text import draw_glyphs, draw_text, render_text
 
 # constants
 RICH_BLACK = (26, 27, 41)
@@ -12,15 +18,6 @@ PRINCETON_ORANGE = (237, 125, 58)
 ORANGE = (247, 149, 27)
 RED = (239, 45, 86)
 
-def draw_text(text, font, color, screen, x, y, center=True):
-    textobj = font.render(text, 1, color)
-    textrect = textobj.get_rect()
-    if center:
-        textrect.center = (x, y)
-    else:
-        textrect.topleft = (x, y)
-    screen.blit(textobj, textrect)
-
 class Difficulty:
 
     def __init__(self, diff):
@@ -66,12 +63,19 @@ class Snake(pygame.sprite.Sprite):
         self.width = width
         self.height = height
         self.font = font
-        self.image = pygame.image.load('./assets/snake_charm/snake.png')
+        self.image = assets.image('./assets/snake_charm/snake.png')
         self.rect = self.image.get_rect(center = (width/2, height/4))
         self.current_health = self.maximum_health = self.target_health = max_hp
         self.health_bar_length = 400
         self.health_ratio = self.maximum_health / self.health_bar_length
         self.health_change_speed = 5
+        # bar rects resized in place, and the HP label rendered when the HP changes
+        self.bar_rect = pygame.Rect((width - self.health_bar_length)/2, height/20, self.health_bar_length, 25)
+        self.hp_rect = self.bar_rect.copy()
+        self.transition_bar_rect = self.bar_rect.copy()
+        self.hp_label = None
+        self.hp_label_health = None
+        self.hp_label_rect = None
     
     def update(self):
         self.health_bar()
@@ -85,19 +89,27 @@ class Snake(pygame.sprite.Sprite):
             transition_width = (self.current_health - self.target_health) // self.health_ratio
             transition_colour = PRINCETON_ORANGE
 
-        hp_rect  = pygame.Rect((self.width - self.health_bar_length)/2, self.height/20, self.current_health / self.health_ratio, 25)
-        transition_bar_rect  = pygame.Rect(hp_rect.right - transition_width, self.height/20, transition_width, 25)
+        hp_rect = self.hp_rect
+        hp_rect.width = int(self.current_health / self.health_ratio)
+        transition_bar_rect = self.transition_bar_rect
+        transition_bar_rect.width = int(transition_width)
+        transition_bar_rect.left = hp_rect.right - transition_bar_rect.width
+
+        if self.hp_label_health != self.current_health:
+            self.hp_label = render_text("HP: " + str(self.current_health), self.font, AZURE)
+            self.hp_label_rect = self.hp_label.get_rect(center=(self.width/2, self.bar_rect.centery))
+            self.hp_label_health = self.current_health
 
         pygame.draw.rect(self.screen, RED, hp_rect)
         pygame.draw.rect(self.screen, transition_colour, transition_bar_rect)
-        pygame.draw.rect(self.screen, AZURE, ((self.width - self.health_bar_length)/2, self.height/20, self.health_bar_length, 25), 3)
-        draw_text("HP: " + str(self.current_health), self.font, AZURE, self.screen, self.width/2, transition_bar_rect.centery)
+        pygame.draw.rect(self.screen, AZURE, self.bar_rect, 3)
+        self.screen.blit(self.hp_label, self.hp_label_rect)
 
     def change_snake(self, win):
         if win:
-            self.image = pygame.image.load('./assets/snake_charm/happy_snake.png')
+            self.image = assets.image('./assets/snake_charm/happy_snake.png')
         else:
-            self.image = pygame.image.load('./assets/snake_charm/mad_snake.png')
+            self.image = assets.image('./assets/snake_charm/mad_snake.png')
 
     def get_visual_hp(self):
         return self.current_health
@@ -111,6 +123,49 @@ class Snake(pygame.sprite.Sprite):
         if self.target_health < 0:
             self.target_health = 0
 
+class WordSlot:
+
+    __slots__ = ("word", "spawn_time", "colour", "bg", "pos", "surface", "rect", "damage", "damage_rect")
+
+    def __init__(self, pos):
+        """Place for a word on screen, with the word's rendered surfaces
+
+        Parameters
+        ----------
+        pos : tuple of float
+            Center of the slot
+        """
+        self.word = ""
+        self.spawn_time = 0
+        self.colour = RICH_BLACK
+        self.bg = pygame.Rect(0, 0, 240, 120)
+        self.bg.center = pos
+        self.pos = pos
+        self.surface = self.rect = self.damage = self.damage_rect = None
+
+    def set(self, word, spawn_time, colour, font, damage):
+        """Put a word ("" for none) in the slot and render it"""
+        self.word = word
+        self.spawn_time = spawn_time
+        self.damage = self.damage_rect = None
+        self.recolour(colour, font)
+        if word != "":
+            self.damage = render_text(str(damage), font, AZURE)
+            self.damage_rect = self.damage.get_rect(center=(self.pos[0], self.pos[1] + 20))
+
+    def recolour(self, colour, font):
+        """Change the colour of the word, rendering it again"""
+        self.colour = colour
+        self.surface = self.rect = None
+        if self.word != "":
+            self.surface = render_text(self.word, font, colour)
+            self.rect = self.surface.get_rect(center=(self.pos[0], self.pos[1] - 20))
+
+    def draw(self, screen):
+        if self.word != "":
+            screen.blit(self.surface, self.rect)
+            screen.blit(self.damage, self.damage_rect)
+
 # TODO
 # UI
 # snake movement
@@ -121,18 +176,21 @@ class SnakeCharmer:
     spawn_delay = 250
     clear_prev_word_event = pygame.USEREVENT + 2
     clear_delay = 750
+    # number of words on screen, in rows of two
+    word_slots = 4
+    # submit as soon as the typed word matches one word and starts no other
+    auto_submit = os.environ.get("SNAKES_AUTO_SUBMIT") == "1"
 
     def __init__(self, diff, screen, clock, font, width, height, fps):
 
-        pygame.mixer.init()
-        self.correct_word = pygame.mixer.Sound("./assets/snake_charm/correct.mp3")
-        self.incorrect_word = pygame.mixer.Sound("./assets/snake_charm/incorrect.mp3")
-        self.type = pygame.mixer.Sound("./assets/snake_charm/type.wav")
-        self.type.set_volume(0.4)
+        # decoded once per process by the sound bank
+        self.correct_word = lifecycle.track_sound(sounds.bank.sound("./assets/snake_charm/correct.mp3"))
+        self.incorrect_word = lifecycle.track_sound(sounds.bank.sound("./assets/snake_charm/incorrect.mp3"))
+        self.type = lifecycle.track_sound(sounds.bank.sound("./assets/snake_charm/type.wav", volume=0.4))
 
-        self.instructions_img = pygame.image.load('./assets/snake_charm/instructions.png')
+        self.instructions_img = assets.image('./assets/snake_charm/instructions.png')
 
-        pygame.key.set_repeat(400, 35)
+        lifecycle.set_repeat(400, 35)
 
         self.diff = Difficulty(diff)
         self.screen = screen
@@ -142,63 +200,78 @@ class SnakeCharmer:
         self.height = height
         self.fps = fps
         
-        self.words = self.read_words()
+        # words on screen and in prev_words are taken from the sampler
+        self.words = words.load(words.PATH)
+        self.sampler = self.words.sampler(diff, self.diff.diff_len())
+        # matches the typed word against the spawned words as it is typed
+        self.matcher = words.PrefixMatcher()
         self.typed_word = "Start Typing..."
+        self.typed_surface = None  # rendered typed word, None when it changed
+        self.typed_rect = None
         self.total_time = self.diff.total_time()
         self.game_over = False
         self.win = False
         self.start_game = False
-        self.spawned_words = [("", 0, RICH_BLACK), ("", 0, RICH_BLACK), ("", 0, RICH_BLACK), ("", 0, RICH_BLACK)]
+        self.spawned_words = [WordSlot(self.calc_word_pos(i)) for i in range(self.word_slots)]
+        # pre-rendered background, word backgrounds and typed word box (see get_panel_layer)
+        self.panel_layer = None
+        self.panel_layer_key = None
         self.prev_words = []
         self.prev_word_index = -1
-        self.snake = pygame.sprite.GroupSingle(Snake(screen, width, height, font, self.diff.snake_hp()))
-
-        self.play_minigame()
-
-    def read_words(self):
-        words = []
-        with open("./assets/snake_charm/words.txt", "r") as reader:
-            line = reader.readline()
-            while line != "":
-                words.append(line[:len(line)-1])
-                line = reader.readline()
-        return words
+        self.snake = lifecycle.track_group(pygame.sprite.GroupSingle(Snake(screen, width, height, font, self.diff.snake_hp())))
 
     def free_index(self):
-        for i, word in enumerate(self.spawned_words):
-            if (word[0] == "" and i != self.prev_word_index):
+        for i, slot in enumerate(self.spawned_words):
+            if (slot.word == "" and i != self.prev_word_index):
                 return i
         return -1
 
     def spawn_word(self):
-        filtered_words = list(filter(self.diff.diff_len(), self.words))
-        while True:
-            idx = random.randint(0, len(filtered_words) - 1)
-            valid_word = True
-            # if the random word is already spawned
-            for word in self.spawned_words:
-                if (filtered_words[idx] == word[0]):
-                    valid_word = False
-                    break
-            # if the random word has spawned recently
-            if (filtered_words[idx] in self.prev_words):
-                valid_word = False
-            if (valid_word): 
-                break
-
-        return filtered_words[idx]
+        """Returns a word that isn't spawned or recently used, or "" (an empty
+        slot) if there are none left"""
+        word = self.sampler.take()
+        return "" if word is None else word
+
+    def set_word(self, index, word, spawn_time, colour):
+        """Puts a word ("" for none) in a slot, keeping the matcher in sync"""
+        self.spawned_words[index].set(word, spawn_time, colour, self.font, len(word) * self.diff.damage_multi())
+        self.matcher.add(index, word)
+
+    def clear_words(self):
+        """Empties every word slot, making their words available again"""
+        for i, slot in enumerate(self.spawned_words):
+            self.sampler.release(slot.word)
+            self.set_word(i, "", 0, RICH_BLACK)
+
+    def type_text(self, text):
+        """Appends typed characters to the typed word"""
+        self.typed_word += text
+        self.typed_surface = None
+        self.matcher.push(text)
+
+    def erase_char(self):
+        """Erases the last character of the typed word"""
+        self.typed_word = self.typed_word[:-1]
+        self.typed_surface = None
+        self.matcher.pop()
+
+    def clear_typed(self):
+        """Erases the typed word"""
+        self.typed_word = ""
+        self.typed_surface = None
+        self.matcher.clear()
     
     def prev_words_queue(self, word):
         if (word == ""): return
         if len(self.prev_words) == 4:
-            self.prev_words.pop(0)
+            self.sampler.release(self.prev_words.pop(0))
         self.prev_words.append(word)
     
     def despawn_word(self, curr_time):
-        for i, word in enumerate(self.spawned_words):
-            if (curr_time - word[1] > self.diff.word_multi() * len(word[0])):
-                self.prev_words_queue(word[0])
-                self.spawned_words[i] = ("", word[1], RICH_BLACK)
+        for i, slot in enumerate(self.spawned_words):
+            if (curr_time - slot.spawn_time > self.diff.word_multi() * len(slot.word)):
+                self.prev_words_queue(slot.word)
+                self.set_word(i, "", slot.spawn_time, RICH_BLACK)
 
     def get_colour(self, len, spawn_time):
         diff_time = self.diff.word_multi() * len
@@ -208,38 +281,100 @@ class SnakeCharmer:
             return PRINCETON_ORANGE
         return RED
 
-    # could probably math it out instead of hard coding
     def calc_word_pos(self, index):
-        if (index == 0):
-            return (self.width/5*2, self.height/3*2)
-        elif (index == 1):
-            return (self.width/5*3, self.height/3*2)
-        elif (index == 2):
-            return (self.width/5*2, self.height/7*6)
-        return (self.width/5*3, self.height/7*6)
+        # two rows of slots a fifth of the screen apart, each centered on its
+        # own (the second row is one shorter for an odd number of slots)
+        first_row = (self.word_slots + 1) // 2
+        row, column = divmod(index, first_row)
+        columns = first_row if row == 0 else self.word_slots - first_row
+        x = self.width/2 + (column - (columns - 1) / 2) * self.width/5
+        return (x, self.height/3*2 if row == 0 else self.height/7*6)
 
     def draw_snake(self):
         self.snake.draw(self.screen)
         self.snake.update()
 
+    def draw_frame(self, elapsed_time):
+        """Draw the timer, the boss snake, the spawned words and the typed word"""
+        # draw the static panels (acts as a screen clear)
+        self.screen.blit(self.get_panel_layer(), (0, 0))
+
+        # the timer changes every frame, so it is drawn from cached characters
+        label = render_text("Time Left: ", self.font, AZURE)
+        self.screen.blit(label, (self.width/12, self.height/20))
+        draw_glyphs(str(round(self.total_time - elapsed_time, 3)), self.font, AZURE, self.screen, self.width/12 + label.get_width(), self.height/20)
+
+        # draw boss snake
+        self.draw_snake()
+
+        # highlight the words starting with the typed word
+        for i in self.matcher.candidates():
+            pygame.draw.rect(self.screen, ORANGE, self.spawned_words[i].bg, 4, 15)
+
+        # draws all words, rendering them again only when their colour changes
+        for slot in self.spawned_words:
+            if (slot.word != ""):
+                colour = self.get_colour(len(slot.word), elapsed_time - slot.spawn_time)
+                if colour != slot.colour:
+                    slot.recolour(colour, self.font)
+                slot.draw(self.screen)
+
+        # draws users text
+        if self.typed_surface is None:
+            self.typed_surface = render_text(self.typed_word, self.font, RICH_BLACK)
+            self.typed_rect = self.typed_surface.get_rect(center=(self.width/2, self.height/2))
+        self.screen.blit(self.typed_surface, self.typed_rect)
+
+    def get_panel_layer(self):
+        """Get the pre-rendered static layer of the game screen, built once and
+        rebuilt only when the screen size changes"""
+        key = self.screen.get_size()
+        if self.panel_layer is None or key != self.panel_layer_key:
+            self.panel_layer = self.render_panel_layer()
+            self.panel_layer_key = key
+        return self.panel_layer
+
+    def render_panel_layer(self):
+        """Render the background, the word backgrounds and the background of
+        where the user types onto a new surface"""
+        layer = self.screen.copy()
+        layer.fill(RICH_BLACK)
+
+        # draw word backgrounds
+        for slot in self.spawned_words:
+            pygame.draw.rect(layer, AZURE, slot.bg, 4, 15)
+
+        # draws background of where user types
+        typed_bg = pygame.Rect(self.width, self.height, 250, 45)
+        typed_bg.center = (self.width/2, self.height/2)
+        pygame.draw.rect(layer, AZURE, typed_bg, 0, 15)
+        return layer
+
     def instructions(self):
 
         running = True
         click = False
 
-        self.spawned_words = [(self.spawn_word(), 0, EMERALD), (self.spawn_word(), 0, PRINCETON_ORANGE), (self.spawn_word(), 0, RED), (self.spawn_word(), 0, EMERALD)]
+        self.clear_words()
+        for i in range(len(self.spawned_words)):
+            self.set_word(i, self.spawn_word(), 0, (EMERALD, PRINCETON_ORANGE, RED)[i % 3])
+        back_button = pygame.Rect(50, 100, 100, 40)
+        back_button.center = (self.width/18, self.height/7*6)
+
+        # the page is static, so only wake up for input (handled before drawing,
+        # so the frame drawn is the one shown until the next event)
+        pacer = FramePacer(self.clock, self.fps, on_demand=True)
         while running:
-            self.clock.tick(self.fps)
-    
-            self.screen.fill(RICH_BLACK)
-           
-            self.screen.blit(self.instructions_img, (0, 0))
+            for event in pacer.events():
+                if event.type == QUIT:
+                    pygame.quit()
+                    sys.exit()
+                if event.type == MOUSEBUTTONDOWN:
+                    if event.button == 1:
+                        click = True
 
             mx, my = pygame.mouse.get_pos()
 
-            back_button = pygame.Rect(50, 100, 100, 40)
-            back_button.center = (self.width/18, self.height/7*6)
-
             if back_button.collidepoint((mx, my)):
                 if click:
                     running = False
@@ -247,34 +382,36 @@ class SnakeCharmer:
 
             click = False
 
+            self.screen.fill(RICH_BLACK)
+            self.screen.blit(self.instructions_img, (0, 0))
             pygame.draw.rect(self.screen, AZURE, back_button, 0, 100)
             draw_text('Back', self.font, RICH_BLACK, self.screen, self.width/18, self.height/7*6)
 
-            for event in pygame.event.get():
-                if event.type == QUIT:
-                    pygame.quit()
-                    sys.exit()
-                if event.type == MOUSEBUTTONDOWN:
-                    if event.button == 1:
-                        click = True
-            
             pygame.display.update()
+            pacer.tick()
 
     def menu(self):
 
         click = False
         
+        play_button = pygame.Rect(50, 100, 200, 50)
+        instruction_button = pygame.Rect(50, 200, 200, 50)
+        play_button.center = (self.width/2, self.height/2 - 50)
+        instruction_button.center = (self.width/2, self.height/2 + 50)
+
+        # the menu is static, so only wake up for input (handled before drawing,
+        # so the menu is drawn again as soon as the instructions are closed)
+        pacer = FramePacer(self.clock, self.fps, on_demand=True)
         while not self.start_game:
+            for event in pacer.events():
+                if event.type == QUIT:
+                    pygame.quit()
+                    sys.exit()
+                if event.type == MOUSEBUTTONDOWN:
+                    if event.button == 1:
+                        click = True
 
-            self.clock.tick(self.fps)
-            self.screen.fill(RICH_BLACK)
-            draw_text("Welcome to Snake Charmer!", self.font, AZURE, self.screen, self.width/2, self.height/4)
             mx, my = pygame.mouse.get_pos()
-    
-            play_button = pygame.Rect(50, 100, 200, 50)
-            instruction_button = pygame.Rect(50, 200, 200, 50)
-            play_button.center = (self.width/2, self.height/2 - 50)
-            instruction_button.center = (self.width/2, self.height/2 + 50)
 
             if play_button.collidepoint((mx, my)):
                 if click:
@@ -284,41 +421,35 @@ class SnakeCharmer:
                 if click:
                     self.instructions()
 
+            click = False
+
+            self.screen.fill(RICH_BLACK)
+            draw_text("Welcome to Snake Charmer!", self.font, AZURE, self.screen, self.width/2, self.height/4)
             pygame.draw.rect(self.screen, AZURE, play_button, 0, 100)
             draw_text('Play Game', self.font, RICH_BLACK, self.screen, self.width/2, self.height/2 - 50)
             pygame.draw.rect(self.screen, AZURE, instruction_button, 0, 100)
             draw_text('Instructions', self.font, RICH_BLACK, self.screen, self.width/2, self.height/2 + 50)
-    
-            click = False
-            for event in pygame.event.get():
-                if event.type == QUIT:
-                    pygame.quit()
-                    sys.exit()
-                if event.type == MOUSEBUTTONDOWN:
-                    if event.button == 1:
-                        click = True
-    
+
             pygame.display.update()
+            pacer.tick()
 
-    def user_submit(self):
-        correct = False
-        for i, word in enumerate(self.spawned_words):
-            if (self.typed_word.lower() == word[0].lower() and self.typed_word != ""):
-                correct = True
-                self.spawned_words[i] = ("", -9999, RICH_BLACK)
-                self.prev_word_index = i
-                pygame.time.set_timer(self.clear_prev_word_event, self.clear_delay, True)
-                self.prev_words_queue(word[0])
-                break
+    def user_submit(self, since=None):
+        # the slot of the first spawned word equal to the typed word (ignoring case)
+        i = self.matcher.match()
+        correct = i is not None
         if (correct):
+            self.prev_words_queue(self.spawned_words[i].word)
+            self.set_word(i, "", -9999, RICH_BLACK)
+            self.prev_word_index = i
+            lifecycle.set_timer(self.clear_prev_word_event, self.clear_delay, True)
             damage = len(self.typed_word) * self.diff.damage_multi()
             self.snake.sprite.hit_snake(damage)
-            pygame.mixer.Sound.play(self.correct_word)
+            sounds.bank.play(self.correct_word, since=since)
             pygame.mixer.music.stop()
         else:
-            pygame.mixer.Sound.play(self.incorrect_word)
+            sounds.bank.play(self.incorrect_word, since=since)
             pygame.mixer.music.stop()
-        self.typed_word = ""
+        self.clear_typed()
        
     def play_minigame(self):
 
@@ -328,19 +459,22 @@ class SnakeCharmer:
             self.menu()
 
             # main game loop
-            self.spawned_words = [("", 0, RICH_BLACK), ("", 0, RICH_BLACK), ("", 0, RICH_BLACK), ("", 0, RICH_BLACK)]
+            self.clear_words()
 
-            pygame.time.set_timer(self.spawn_word_event, self.spawn_delay)
+            lifecycle.set_timer(self.spawn_word_event, self.spawn_delay)
 
             start_tick = pygame.time.get_ticks() / 1000
             end_tick = pygame.time.get_ticks() / 1000
+            last_poll = pygame.time.get_ticks()
 
+            stats = frame_stats.begin("snake_charmer", self.fps)
+            pacer = FramePacer(self.clock, self.fps, stats=stats)
             while not self.game_over:
+                stats.frame()
 
-                self.clock.tick(self.fps)
-                self.screen.fill(RICH_BLACK)
+                pacer.tick()
+                stats.mark("tick")
                 elapsed_time = end_tick - start_tick
-                draw_text("Time Left: " + str(round(self.total_time - elapsed_time, 3)), self.font, AZURE, self.screen, self.width/12, self.height/20, False)
                 end_tick = pygame.time.get_ticks() / 1000
 
                 # check to see if the game is lost
@@ -348,38 +482,21 @@ class SnakeCharmer:
                     self.game_over = True
                     break
 
-                # draw boss snake
-                self.draw_snake()
-
-                # draw word backgrounds
-                for i in range(len(self.spawned_words)):
-                    bg = pygame.Rect(self.width, self.height, 240, 120)
-                    bg.center = self.calc_word_pos(i)
-                    pygame.draw.rect(self.screen, AZURE, bg, 4, 15)
-
-                # draws all words
-                for i, word in enumerate(self.spawned_words):
-                    self.spawned_words[i] = (word[0], word[1], self.get_colour(len(word[0]), elapsed_time - word[1]))
-                    word_pos = self.calc_word_pos(i)
-                    if (word[0] != ""):
-                        draw_text(word[0], self.font, word[2], self.screen, word_pos[0], word_pos[1] - 20)
-                        draw_text(str(len(word[0]) * self.diff.damage_multi()), self.font, AZURE, self.screen, word_pos[0], word_pos[1] + 20)
-
-                 # draws background of where user types
-                typed_bg = pygame.Rect(self.width, self.height, 250, 45)
-                typed_bg.center = (self.width/2, self.height/2)
-                pygame.draw.rect(self.screen, AZURE, typed_bg, 0, 15)
-                # draws users text
-                draw_text(self.typed_word, self.font, RICH_BLACK, self.screen, self.width/2, self.height/2)
+                self.draw_frame(elapsed_time)
 
                 # despawns any expired words
                 self.despawn_word(elapsed_time)
+                stats.mark("draw")
 
                 # check to see if game is won
                 if self.snake.sprite.get_visual_hp() <= 0:
                     self.game_over = True
                     break
 
+                # keys pressed now were pressed no earlier than the previous
+                # poll, so timing them from it gives an upper bound of their latency
+                pressed = last_poll
+                last_poll = pygame.time.get_ticks()
                 for event in pygame.event.get():
                     if event.type == QUIT:
                         pygame.quit()
@@ -387,26 +504,31 @@ class SnakeCharmer:
                     elif event.type == self.spawn_word_event:
                         index = self.free_index()
                         if (index != -1):
-                            self.spawned_words[index] = ((self.spawn_word(), elapsed_time, EMERALD))
+                            self.set_word(index, self.spawn_word(), elapsed_time, EMERALD)
                     elif event.type == self.clear_prev_word_event:
                         self.prev_word_index = -1
                     elif event.type == KEYDOWN:
+                        if (self.typed_word == "Start Typing..."):
+                            self.clear_typed()
                         if event.key == K_RETURN:
-                            self.user_submit()
+                            self.user_submit(pressed)
                         elif event.key == K_BACKSPACE:
-                            pygame.mixer.Sound.play(self.type)
+                            sounds.bank.play(self.type, "typing", pressed)
                             pygame.mixer.music.stop()
-                            self.typed_word = self.typed_word[:-1]
+                            self.erase_char()
                         elif event.key == K_ESCAPE:
-                            self.typed_word = ""
+                            self.clear_typed()
                         else:
-                            pygame.mixer.Sound.play(self.type)
+                            sounds.bank.play(self.type, "typing", pressed)
                             pygame.mixer.music.stop()
-                            if (self.typed_word == "Start Typing..."):
-                                self.typed_word = ""
-                            self.typed_word += event.unicode
+                            self.type_text(event.unicode)
+                            if self.auto_submit and self.matcher.unique_match() is not None:
+                                self.user_submit(pressed)
+                stats.mark("events")
 
+                stats.draw_overlay(self.screen)
                 pygame.display.update()
+                stats.mark("flip")
 
             # end game loop
             while True:
@@ -429,6 +551,7 @@ if __name__ == "__main__":
     diff = "hard" # easy, medium or hard
 
     # initialize
+    sounds.pre_init()
     pygame.init()
     pygame.font.init()
     font = pygame.font.SysFont("timesnewroman", 20)
@@ -3,6 +3,9 @@ import sys
 import pygame
 import time
 import random
+import frame_stats
+from pacing import FramePacer
+from text import render_text, sys_font
 
 
 class SnakeGame:
@@ -15,8 +18,8 @@ class SnakeGame:
         self.h = h
         self.fps = fps
 
-        self.font_style = pygame.font.SysFont("bahnschrift", 25)
-        self.score_font = pygame.font.SysFont("comicsansms", 35)
+        self.font_style = sys_font("bahnschrift", 25)
+        self.score_font = sys_font("comicsansms", 35)
 
         #Snake head size
         self.snake_block = 40
@@ -31,18 +34,44 @@ class SnakeGame:
 
     #Displays amount of food needed to win the game
     def Your_score(self, score):
-        value = self.score_font.render("Food needed to win: " + str(score), True, font_green)
-        dis.blit(value, [0, 0])
+        value = render_text("Food needed to win: " + str(score), self.score_font, font_green)
+        self.screen.blit(value, [0, 0])
 
 
 
     def our_snake(self, snake_block, snake_list):
         for x in snake_list:
-            pygame.draw.rect(dis, mantis, [x[0], x[1], snake_block, snake_block])
+            pygame.draw.rect(self.screen, mantis, [x[0], x[1], snake_block, snake_block])
+
+    def draw_frame(self, foodx, foody, snake_list, score):
+        """Draw the food, the snake and the food left to win"""
+        self.screen.fill(rich_black)
+        pygame.draw.rect(self.screen, princeton_orange, [foodx, foody, self.snake_block, self.snake_block])
+        self.our_snake(self.snake_block, snake_list)
+        self.Your_score(score)
+
+    def steer(self, key, curr_dir):
+        """Turn the snake with an arrow key, it can't turn back on itself
+
+        Returns
+        -------
+        tuple
+            (x change, y change, direction) after the key, None if the key
+            doesn't turn the snake
+        """
+        if key == pygame.K_LEFT and curr_dir != 1:
+            return -self.snake_block, 0, 3
+        elif key == pygame.K_RIGHT and curr_dir != 3:
+            return self.snake_block, 0, 1
+        elif key == pygame.K_UP and curr_dir != 2:
+            return 0, -self.snake_block, 0
+        elif key == pygame.K_DOWN and curr_dir != 0:
+            return 0, self.snake_block, 2
+        return None
 
     def message(self, msg, color):
-        mesg = self.font_style.render(msg, True, color)
-        dis.blit(mesg, [self.w / 2, self.h / 3])
+        mesg = render_text(msg, self.font_style, color)
+        self.screen.blit(mesg, [self.w / 2, self.h / 3])
 
 
     def play_minigame(self):
@@ -69,15 +98,19 @@ class SnakeGame:
         foodx = round(random.randrange(0, self.w - self.snake_block)/40.0) * 40.0
         foody = round(random.randrange(0, self.h - self.snake_block)/40.0) * 40.0
 
-        dis.fill(rich_black)
+        self.screen.fill(rich_black)
         self.Your_score(food_to_win)
         self.message("Use the arrow keys to move and collect food!", font_green)
         pygame.display.update()
         pygame.time.wait(3000)
+        stats = frame_stats.begin("snake_game", self.snake_speed)
+        # the snake moves one block per frame, so the cap also slows it down
+        pacer = FramePacer(self.clock, self.snake_speed, stats=stats)
         while not game_over:
+            stats.frame()
 
             if food_to_win == 0:
-                dis.fill(rich_black)
+                self.screen.fill(rich_black)
                 self.message("You win!", white)
                 self.Your_score(food_to_win)
                 pygame.display.update()
@@ -85,7 +118,7 @@ class SnakeGame:
                 return True
 
             while game_close == True:
-                dis.fill(rich_black)
+                self.screen.fill(rich_black)
                 self.message("You Lose!", red)
                 self.Your_score(food_to_win)
                 pygame.display.update()
@@ -96,29 +129,15 @@ class SnakeGame:
                 if event.type == pygame.QUIT:
                     return False
                 if event.type == pygame.KEYDOWN:
-                    if event.key == pygame.K_LEFT and curr_dir != 1:
-                        x1_change = -self.snake_block
-                        y1_change = 0
-                        curr_dir = 3
-                    elif event.key == pygame.K_RIGHT and curr_dir != 3:
-                        x1_change = self.snake_block
-                        y1_change = 0
-                        curr_dir = 1
-                    elif event.key == pygame.K_UP and curr_dir != 2:
-                        y1_change = -self.snake_block
-                        x1_change = 0
-                        curr_dir = 0
-                    elif event.key == pygame.K_DOWN and curr_dir != 0:
-                        y1_change = self.snake_block
-                        x1_change = 0
-                        curr_dir = 2
+                    turn = self.steer(event.key, curr_dir)
+                    if turn is not None:
+                        x1_change, y1_change, curr_dir = turn
+            stats.mark("events")
 
             if x1 >= self.w or x1 < 0 or y1 >= self.h or y1 < 0:
                 game_close = True
             x1 += x1_change
             y1 += y1_change
-            dis.fill(rich_black)
-            pygame.draw.rect(dis, princeton_orange, [foodx, foody, self.snake_block, self.snake_block])
             snake_Head = []
             snake_Head.append(x1)
             snake_Head.append(y1)
@@ -130,10 +149,12 @@ class SnakeGame:
                 if x == snake_Head:
                     game_close = True
 
-            self.our_snake(self.snake_block, snake_List)
-            self.Your_score(food_to_win)
+            self.draw_frame(foodx, foody, snake_List, food_to_win)
+            stats.draw_overlay(self.screen)
+            stats.mark("draw")
 
             pygame.display.update()
+            stats.mark("flip")
 
             if x1 == foodx and y1 == foody:
                 foodx = round(random.randrange(0, self.w - self.snake_block) / 40.0) * 40.0
@@ -145,8 +166,10 @@ class SnakeGame:
                 else:
                     Length_of_snake += 5
                 food_to_win -= 1
+            stats.mark("update")
 
-            clock.tick(self.snake_speed)
+            pacer.tick()
+            stats.mark("tick")
         return True
 
 #Colour constants
@@ -165,11 +188,6 @@ azure = (230, 250, 252)
 mantis = (140, 216, 103)
 emerald = (47, 191, 113)
 
-dis = pygame.display.set_mode((1280, 720))
-
-
-clock = pygame.time.Clock()
-
 if __name__ == "__main__":
     # constants
     width = 1280
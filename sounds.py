@@ -0,0 +1,141 @@
+"""Sound bank and low-latency mixer setup shared by the game and the minigames
+
+pre_init() must run before pygame.init() so the mixer is opened with a small
+buffer (SNAKES_AUDIO_BUFFER samples, 256 by default) instead of pygame's default,
+which delays every sound by the time it takes to play a whole buffer.
+
+Sounds are decoded once per process by the bank. High-frequency effects (like
+the typing sound) play on reserved channels, so they never wait for or steal a
+channel from the other sounds.
+
+Set SNAKES_AUDIO_LATENCY=1 to print the measured key press to sound latency when
+the game exits. It is only measured if the mixer was opened after pre_init(),
+since pygame doesn't tell the buffer size of a mixer opened otherwise.
+"""
+import atexit
+import os
+from collections import deque
+
+import pygame
+
+FREQUENCY = 44100
+BUFFER = int(os.environ.get("SNAKES_AUDIO_BUFFER", 256))  # samples per channel
+RESERVED = ("typing",)  # names of the reserved channels
+
+# buffer size set by pre_init, None if the mixer was opened without it
+buffer = None
+
+
+def pre_init():
+    """Set the mixer parameters, call before pygame.init()"""
+    global buffer
+    pygame.mixer.pre_init(FREQUENCY, -16, 2, BUFFER)
+    if not pygame.mixer.get_init():
+        buffer = BUFFER
+
+
+class SoundBank:
+    def __init__(self):
+        """Process-wide cache of decoded sounds and reserved channels
+
+        Sounds are shared by every caller, so changing the volume of one
+        changes it for everybody.
+        """
+        self.sounds = {}  # normalized path -> pygame.mixer.Sound
+        self.channels = {}  # reserved channel name -> pygame.mixer.Channel
+        self.latencies = deque(maxlen=1000)  # ms from input to sound output
+
+    def init(self):
+        """Open the mixer (if it isn't open) and reserve the channels"""
+        if not pygame.mixer.get_init():
+            pre_init()
+            pygame.mixer.init()
+        if not self.channels:
+            pygame.mixer.set_reserved(len(RESERVED))
+            self.channels = {name: pygame.mixer.Channel(i) for i, name in enumerate(RESERVED)}
+
+    def sound(self, path, volume=None):
+        """Get a sound, decoding the file the first time
+
+        Parameters
+        ----------
+        path : str
+            Path of the sound file
+        volume : float, optional
+            Volume to set (0.0 to 1.0), by default None (unchanged)
+
+        Returns
+        -------
+        pygame.mixer.Sound
+            Decoded sound
+        """
+        self.init()
+        key = os.path.normpath(path)
+        sound = self.sounds.get(key)
+        if sound is None:
+            sound = self.sounds[key] = pygame.mixer.Sound(path)
+        if volume is not None:
+            sound.set_volume(volume)
+        return sound
+
+    def output_latency(self):
+        """Milliseconds the mixer buffers a sound before it is heard, None if
+        the buffer size isn't known (the mixer was opened without pre_init)"""
+        if buffer is None:
+            return None
+        frequency, _, _ = pygame.mixer.get_init()
+        return 1000 * buffer / frequency
+
+    def play(self, sound, channel=None, since=None):
+        """Play a sound
+
+        Parameters
+        ----------
+        sound : pygame.mixer.Sound
+            Sound to play
+        channel : str, optional
+            Name of the reserved channel to play it on (restarting what it
+            plays), by default None (any free channel)
+        since : int, optional
+            pygame.time.get_ticks() of the input that triggered the sound, to
+            measure the latency, by default None (not measured). It is not
+            measured either if the buffer size isn't known.
+        """
+        if channel is not None:
+            self.channels[channel].play(sound)
+        else:
+            sound.play()
+        output_latency = self.output_latency()
+        if since is not None and output_latency is not None:
+            self.latencies.append(pygame.time.get_ticks() - since + output_latency)
+
+    def latency_report(self):
+        """Get the input to sound output latency of the recent sounds
+
+        The latency is the time from the input to the play call plus the time
+        the mixer buffer takes to play.
+
+        Returns
+        -------
+        dict
+            Samples, buffer ms and mean/p50/p95/max latency ms
+        """
+        latencies = sorted(self.latencies)
+        if not latencies:
+            return {"samples": 0}
+        return {
+            "samples": len(latencies),
+            "buffer_ms": round(self.output_latency(), 2),
+            "mean_ms": round(sum(latencies) / len(latencies), 2),
+            "p50_ms": round(latencies[len(latencies) // 2], 2),
+            "p95_ms": round(latencies[int(len(latencies) * 0.95)], 2),
+            "max_ms": round(latencies[-1], 2),
+        }
+
+
+# process-wide sound bank
+bank = SoundBank()
+
+
+if os.environ.get("SNAKES_AUDIO_LATENCY") == "1":
+    atexit.register(lambda: print("key press to sound latency", bank.latency_report()))
@@ -0,0 +1,157 @@
+"""Startup timeline tracer for the launcher
+
+Set SNAKES_STARTUP_TRACE to a file path to time every startup phase and module
+import of main.py until the main menu is shown, and write them to that file as
+JSON. Modules imported on demand later (the minigames, see minigames.load) are
+added to the report as they are imported. Two reports can be compared with
+
+    python startup_trace.py old.json new.json
+"""
+import builtins
+import json
+import os
+import sys
+import time
+from contextlib import contextmanager
+
+
+class StartupTracer:
+    def __init__(self, path=None):
+        """Records startup phases and imports (does nothing if path is None)
+
+        Parameters
+        ----------
+        path : str, optional
+            File to write the report to, by default None (disabled)
+        """
+        self.path = path
+        self.enabled = path is not None
+        self.origin = time.perf_counter_ns()
+        self.phases = []  # (name, start, end) in ns since origin
+        self.started = {}  # name -> start of phases that haven't ended
+        self.imports = []  # (module, ns, nesting depth) in the order they finished
+        self.lazy_imports = {}  # module imported on demand -> ms
+        self.report = None  # written by finish
+        self.depth = 0
+        self.original_import = None
+        if self.enabled:
+            self.install_import_hook()
+
+    def now(self):
+        return time.perf_counter_ns() - self.origin
+
+    def begin(self, name):
+        """Start timing a named phase"""
+        if self.enabled:
+            self.started[name] = self.now()
+
+    def end(self, name):
+        """Stop timing a named phase started with begin"""
+        if self.enabled:
+            self.phases.append((name, self.started.pop(name), self.now()))
+
+    @contextmanager
+    def phase(self, name):
+        """Time the body of a with statement as a named phase"""
+        self.begin(name)
+        try:
+            yield
+        finally:
+            self.end(name)
+
+    def mark(self, name):
+        """Record an instant in the timeline"""
+        if self.enabled:
+            now = self.now()
+            self.phases.append((name, now, now))
+
+    def install_import_hook(self):
+        """Time every import of a module that isn't loaded yet"""
+        self.original_import = original_import = builtins.__import__
+
+        def timed_import(name, globals=None, locals=None, fromlist=(), level=0):
+            if level or name in sys.modules:
+                return original_import(name, globals, locals, fromlist, level)
+            start = time.perf_counter_ns()
+            self.depth += 1
+            try:
+                return original_import(name, globals, locals, fromlist, level)
+            finally:
+                self.depth -= 1
+                self.imports.append((name, time.perf_counter_ns() - start, self.depth))
+
+        builtins.__import__ = timed_import
+
+    def lazy_import(self, name, ns):
+        """Record the import of a module imported on demand (after startup),
+        rewriting the report if it was already written"""
+        if self.path is None:
+            return
+        self.lazy_imports[name] = ns / 1e6
+        if self.report is not None:
+            self.write()
+
+    def write(self):
+        with open(self.path, "w") as f:
+            json.dump({**self.report, "lazy_imports": self.lazy_imports}, f, indent=2)
+
+    def finish(self):
+        """Stop tracing and write the report"""
+        if not self.enabled:
+            return
+        self.mark("done")
+        if self.original_import is not None:
+            builtins.__import__ = self.original_import
+            self.original_import = None
+        self.enabled = False
+
+        self.report = {
+            "total_ms": self.now() / 1e6,
+            "phases": [
+                {"name": name, "start_ms": start / 1e6, "ms": (end - start) / 1e6}
+                for name, start, end in self.phases
+            ],
+            # top-level imports only, nested ones are included in their parent
+            "imports": {
+                name: ns / 1e6 for name, ns, depth in self.imports if depth == 0
+            },
+            "nested_imports": {
+                name: ns / 1e6 for name, ns, depth in self.imports if depth > 0
+            },
+        }
+        self.write()
+
+
+def compare(old_path, new_path):
+    """Print the phase and import timings of two reports side by side"""
+    with open(old_path) as f:
+        old = json.load(f)
+    with open(new_path) as f:
+        new = json.load(f)
+
+    def row(name, a, b):
+        a_text = "-" if a is None else f"{a:9.2f}"
+        b_text = "-" if b is None else f"{b:9.2f}"
+        delta = "" if a is None or b is None else f"{b - a:+9.2f}"
+        print(f"{name:40} {a_text:>9} {b_text:>9} {delta:>9}")
+
+    print(f"{'(ms)':40} {'old':>9} {'new':>9} {'delta':>9}")
+    row("total", old["total_ms"], new["total_ms"])
+    old_phases = {phase["name"]: phase["ms"] for phase in old["phases"]}
+    new_phases = {phase["name"]: phase["ms"] for phase in new["phases"]}
+    for name in {**old_phases, **new_phases}:
+        row(name, old_phases.get(name), new_phases.get(name))
+    for name in {**old["imports"], **new["imports"]}:
+        row(f"import {name}", old["imports"].get(name), new["imports"].get(name))
+    old_lazy = old.get("lazy_imports", {})
+    new_lazy = new.get("lazy_imports", {})
+    for name in {**old_lazy, **new_lazy}:
+        row(f"lazy import {name}", old_lazy.get(name), new_lazy.get(name))
+
+
+# tracer used by main.py
+tracer = StartupTracer(os.environ.get("SNAKES_STARTUP_TRACE"))
+
+
+if __name__ == "__main__":
+    compare(sys.argv[1], sys.argv[2])
@@ -0,0 +1,33 @@
+import os
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import pygame
+import pytest
+
+from frame_stats import FrameStats
+from pacing import FramePacer
+
+
+@pytest.fixture
+def display():
+    pygame.init()
+    yield pygame.display.set_mode([64, 64])
+    pygame.quit()
+
+
+def test_on_demand_frames_are_recorded(display):
+    stats = FrameStats("paced", 1000)
+    pacer = FramePacer(pygame.time.Clock(), 1000, on_demand=True, stats=stats)
+    for i in range(50):
+        stats.frame()
+        # wake the pacer up after the first frame, which is always drawn
+        pygame.event.post(pygame.event.Event(pygame.USEREVENT, frame=i))
+        assert pacer.events()
+        stats.mark("events")
+        pacer.tick()
+        stats.mark("tick")
+    stats.frame()
+
+    assert stats.frames == 50
+    assert sum(stats.histograms["frame"]) == 50
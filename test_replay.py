@@ -0,0 +1,59 @@
+import os
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import pygame
+import pytest
+
+import lifecycle
+import replay
+from snake_charmer import SnakeCharmer
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+WIDTH, HEIGHT, FPS = 1280, 720, 60
+
+
+@pytest.fixture
+def screen(monkeypatch):
+    # assets are loaded relative to the repository
+    monkeypatch.chdir(HERE)
+    # skip the end screen pause of the minigames
+    monkeypatch.setattr(pygame.time, "wait", lambda milliseconds: 0)
+    pygame.init()
+    yield pygame.display.set_mode([WIDTH, HEIGHT])
+    pygame.quit()
+
+
+def play_snake_charmer(screen, runs, seconds):
+    """Play timed SnakeCharmer games the way Game plays minigames"""
+    clock = pygame.time.Clock()
+    font = pygame.font.SysFont("timesnewroman", 20)
+    for _ in range(runs):
+        with lifecycle.Scope("snake_charmer"):
+            minigame = SnakeCharmer("hard", screen, clock, font, WIDTH, HEIGHT, FPS)
+            minigame.start_game = True
+            minigame.total_time = seconds
+            minigame.play_minigame()
+
+
+def test_replay_consumes_every_recorded_call(screen, tmp_path):
+    path = str(tmp_path / "session.jsonl.gz")
+
+    recorder = replay.Recorder(path, seed=3)
+    recorder.install()
+    try:
+        play_snake_charmer(screen, 3, 0.5)
+    finally:
+        recorder.close()
+
+    replayer = replay.Replayer(path, throttle=False)
+    replayer.install()
+    try:
+        play_snake_charmer(screen, 3, 0.5)
+    finally:
+        replayer.uninstall()
+
+    assert not replayer.finished
+    assert replayer.index == recorder.calls
+    assert replayer.index == {kind: len(calls) for kind, calls in replayer.calls.items()}
@@ -0,0 +1,128 @@
+"""Cached text rendering shared by the game and the minigames"""
+from collections import OrderedDict
+
+import pygame
+
+
+class TextCache:
+    def __init__(self, max_bytes=16 * 1024 * 1024):
+        """LRU cache of rendered text surfaces
+
+        Surfaces are keyed by (font, text, color, antialias). Cached surfaces are
+        shared between callers, so they must not be drawn on.
+
+        Parameters
+        ----------
+        max_bytes : int, optional
+            Maximum total pixel memory of the cached surfaces, by default 16 MiB
+        """
+        self.max_bytes = max_bytes
+        self.surfaces = OrderedDict()
+        self.nbytes = 0
+        self.hits = 0
+        self.misses = 0
+
+    def render(self, font, text, color, antialias=True):
+        """Get the rendered surface for a piece of text
+
+        Parameters
+        ----------
+        font : pygame.font.Font
+            Font to render with
+        text : str
+            Text to render
+        color : tuple or pygame.Color
+            Text color
+        antialias : bool, optional
+            Render with antialiasing, by default True
+
+        Returns
+        -------
+        pygame.Surface
+            Rendered text
+        """
+        key = (font, text, tuple(color), bool(antialias))
+        surf = self.surfaces.get(key)
+        if surf is not None:
+            self.hits += 1
+            self.surfaces.move_to_end(key)
+            return surf
+
+        self.misses += 1
+        surf = font.render(text, antialias, color)
+        size = surf.get_width() * surf.get_height() * surf.get_bytesize()
+        if size > self.max_bytes:  # too big to ever fit, don't evict everything
+            return surf
+
+        self.surfaces[key] = surf
+        self.nbytes += size
+        while self.nbytes > self.max_bytes:
+            _, old = self.surfaces.popitem(last=False)
+            self.nbytes -= old.get_width() * old.get_height() * old.get_bytesize()
+        return surf
+
+    def clear(self):
+        """Drop every cached surface (the hit/miss counters are kept)"""
+        self.surfaces.clear()
+        self.nbytes = 0
+
+    def stats(self):
+        """Get the cache counters
+
+        Returns
+        -------
+        dict
+            Number of hits, misses, cached surfaces and cached bytes
+        """
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "entries": len(self.surfaces),
+            "bytes": self.nbytes,
+        }
+
+
+# process-wide cache used by render_text and draw_text
+cache = TextCache()
+
+# (name, size) -> system font created by sys_font
+fonts = {}
+
+
+def sys_font(name, size):
+    """Get a system font, created once per process
+
+    The text cache is keyed on font objects, so text rendered with the font
+    returned here is shared by every caller and every play of a minigame.
+    """
+    font = fonts.get((name, size))
+    if font is None:
+        font = fonts[name, size] = pygame.font.SysFont(name, size)
+    return font
+
+
+def render_text(text, font, color, antialias=True):
+    """Render text through the shared cache (see TextCache.render)"""
+    return cache.render(font, text, color, antialias)
+
+
+def draw_text(text, font, color, screen, x, y, center=True):
+    textobj = cache.render(font, text, color)
+    textrect = textobj.get_rect()
+    if center:
+        textrect.center = (x, y)
+    else:
+        textrect.topleft = (x, y)
+    screen.blit(textobj, textrect)
+
+
+def draw_glyphs(text, font, color, screen, x, y):
+    """Draw text one cached character at a time, from its top left corner
+
+    For text that changes every frame (like a timer), which would miss the cache
+    every frame and evict the surfaces of other text. Kerning is lost.
+    """
+    for char in text:
+        glyph = cache.render(font, char, color)
+        screen.blit(glyph, (x, y))
+        x += glyph.get_width()
@@ -6,6 +6,8 @@ import random
 from pygame.color import Color
 from itertools import product
 from pygame.locals import *
+import frame_stats
+from pacing import FramePacer
 
 red = (255, 0, 0)
 green = (0, 255, 0)
@@ -39,6 +41,9 @@ class TileMemory:
         self.x_margin = (self.w - (self.board_width * (TILE_SIZE + TILE_GAP))) // 2
         self.y_margin = (self.h - (self.board_width * (TILE_SIZE + TILE_GAP))) // 2 
 
+        #(flipped, hovered) state of each tile as it is on the screen
+        self.drawn = {}
+
     def wincon(self, board, flipped):
         """ Win condition: player has flipped all the correct tiles """
         return board == flipped
@@ -94,7 +99,7 @@ class TileMemory:
         The tiles are number height wise and then width wise 
         So the cx and cy are interchanged """
 
-        if cx < self.x_margin or cy < self.y_margin:
+        if cx is None or cx < self.x_margin or cy < self.y_margin:
             return None, None
 
         x = (cy - self.y_margin) // (TILE_SIZE + TILE_GAP)
@@ -125,8 +130,38 @@ class TileMemory:
         for x in range(self.board_width):
             for y in range(self.board_width):
                 self.draw_tile(flipped, x, y, update=False)
+                self.drawn[x, y] = (flipped[x][y], False)
         pygame.display.update()
 
+    def cell_rect(self, x, y):
+        """ Gets the rect of a tile including its hover box """
+
+        px, py = self.get_coord(x, y)
+        return pygame.Rect(px - 5, py - 5, TILE_SIZE + 10, TILE_SIZE + 10)
+
+    def draw_tiles(self, flipped, tiles, hover=None):
+        """ Redraws the given tiles whose flipped or hover state changed since
+            they were last drawn, and updates only their rects on the display
+            Returns the updated rects """
+
+        rects = []
+        for x, y in tiles:
+            state = (flipped[x][y], (x, y) == hover and not flipped[x][y])
+            if self.drawn.get((x, y)) == state:
+                continue
+
+            rect = self.cell_rect(x, y)
+            pygame.draw.rect(self.screen, BG_COLOR, rect)
+            self.draw_tile(flipped, x, y, update=False)
+            if state[1]:
+                self.draw_hover_box(x, y)
+            self.drawn[x, y] = state
+            rects.append(rect)
+
+        if rects:
+            pygame.display.update(rects)
+        return rects
+
     def draw_hover_box(self, x, y):
         """ Draws the highlight box around the square """
 
@@ -154,11 +189,15 @@ class TileMemory:
 
         self.game_start_animation(board)
 
-        while running:
-            self.screen.fill(BG_COLOR)
-            self.draw_board(flipped)
+        #tile with the hover box, only it and clicked tiles are redrawn
+        hover = None
 
-            for event in pygame.event.get():
+        stats = frame_stats.begin("tile_memory", self.fps)
+        # the board only changes on mouse input, so sleep until there is some
+        pacer = FramePacer(self.clock, self.fps, on_demand=True, stats=stats)
+        while running:
+            stats.frame()
+            for event in pacer.events():
                 if event.type == pygame.QUIT:
                     running = False
                 elif event.type == pygame.MOUSEMOTION:
@@ -166,15 +205,17 @@ class TileMemory:
                 elif event.type == pygame.MOUSEBUTTONDOWN:
                     mouse_x, mouse_y = pygame.mouse.get_pos()
                     mouse_clicked = True
+            stats.mark("events")
 
             x, y = self.get_pos(mouse_x, mouse_y)
+            new_hover = None
 
             if x is not None and y is not None:
                 if not flipped[x][y]:
                     if mouse_clicked:
-                        #flips tile and draws board
+                        #flips tile and draws it
                         flipped[x][y] = True
-                        self.draw_tile(flipped, x, y)
+                        self.draw_tiles(flipped, [(x, y)], hover)
                         
                         #selected tile is correct
                         if board[x][y]: 
@@ -193,10 +234,22 @@ class TileMemory:
                             return False
 
                     else:
-                        self.draw_hover_box(x, y)
+                        new_hover = (x, y)
             
             mouse_clicked = False
-            pygame.display.update()
+            stats.mark("update")
+
+            #moves the hover box
+            if new_hover != hover:
+                self.draw_tiles(flipped, [tile for tile in (hover, new_hover) if tile is not None], new_hover)
+                hover = new_hover
+            overlay = stats.draw_overlay(self.screen)
+            if overlay is not None:
+                pygame.display.update(overlay)
+            stats.mark("draw")
+
+            pacer.tick()
+            stats.mark("tick")
         
         else:
             pygame.quit()
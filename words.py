@@ -0,0 +1,415 @@
+"""Word lists of SnakeCharmer
+
+A WordIndex holds the words of a list bucketed by length, and builds the pool of
+words accepted by a difficulty once per difficulty. A WordSampler draws words
+from a pool without replacement in constant time, so the words on screen and
+the recently used ones are never drawn, and it can't stall when the pool runs
+out (it returns None instead). A PrefixMatcher matches what the player types
+against the words on screen as they type it.
+
+Word lists are text files with one word per line, or word packs compiled from
+them for large dictionaries. A pack is memory-mapped and only its header and
+bucket table are read up front, words are decoded when they are drawn, so
+loading one takes the same time and memory whatever its size. Compile a pack with
+
+    python words.py words.txt words.pack
+
+SnakeCharmer loads the word list at SNAKES_WORDS (a text file or a pack), by
+default assets/snake_charm/words.txt.
+
+Pack format (little-endian):
+    header       magic b"SNKW", version (u16), 0 (u16), buckets (u32), words (u32)
+    buckets      per bucket: word length in characters (u32), first word (u32),
+                 number of words (u32), words are stored bucket by bucket
+    offsets      words + 1 byte offsets (u32) of the words in the data
+    data         UTF-8 encoded words
+"""
+import mmap
+import os
+import random
+import struct
+import sys
+from bisect import bisect_right
+
+PACK_MAGIC = b"SNKW"
+PACK_VERSION = 1
+HEADER = struct.Struct("<4sHHII")
+BUCKET = struct.Struct("<III")
+OFFSETS = struct.Struct("<II")  # start and end of a word
+
+PATH = os.environ.get("SNAKES_WORDS", "./assets/snake_charm/words.txt")  # SnakeCharmer's word list
+
+
+class WordSampler:
+    def __init__(self, pool, rng=None):
+        """Draws distinct words from a pool without replacement
+
+        The pool itself is never copied or changed. Words are drawn with a
+        sparse Fisher-Yates shuffle: the available words are the first size
+        positions of the pool, with the positions that were swapped kept in a
+        dict, so take and release are O(1).
+
+        Parameters
+        ----------
+        pool : sequence of str
+            Distinct words to draw from
+        rng : random.Random, optional
+            Random number generator, by default the random module
+        """
+        self.pool = pool
+        self.rng = random if rng is None else rng
+        self.size = len(pool)  # number of words that can be drawn
+        self.swapped = {}  # position < size -> word moved there
+        self.taken = set()
+
+    def __len__(self):
+        return self.size
+
+    def take(self):
+        """Draw a word, uniformly among the words not taken
+
+        Returns
+        -------
+        str or None
+            Word (taken until it is released), None if every word is taken
+        """
+        if self.size == 0:
+            return None
+        i = self.rng.randrange(self.size)
+        last = self.size - 1
+        word = self.swapped.get(i, self.pool[i])
+        # move the last available word into the drawn position
+        self.swapped[i] = self.swapped.pop(last, self.pool[last])
+        if i == last:
+            del self.swapped[i]
+        self.size = last
+        self.taken.add(word)
+        return word
+
+    def release(self, word):
+        """Make a taken word available again (other words are ignored)"""
+        if word not in self.taken:
+            return
+        self.taken.discard(word)
+        if self.pool[self.size] != word:
+            self.swapped[self.size] = word
+        self.size += 1
+
+
+class WordPool:
+    def __init__(self, buckets):
+        """Read-only concatenation of buckets of words, without copying them
+
+        Parameters
+        ----------
+        buckets : list of sequences of str
+            Buckets in order
+        """
+        self.buckets = [bucket for bucket in buckets if len(bucket)]
+        self.starts = []  # index of the first word of each bucket
+        size = 0
+        for bucket in self.buckets:
+            self.starts.append(size)
+            size += len(bucket)
+        self.size = size
+
+    def __len__(self):
+        return self.size
+
+    def __getitem__(self, i):
+        if not 0 <= i < self.size:
+            raise IndexError(i)
+        b = bisect_right(self.starts, i) - 1
+        return self.buckets[b][i - self.starts[b]]
+
+
+class WordIndex:
+    def __init__(self, buckets):
+        """Words bucketed by length
+
+        Parameters
+        ----------
+        buckets : dict
+            Length -> sequence of the distinct words of that length (see
+            bucket_words and WordPack)
+        """
+        self.buckets = buckets
+        self.pools = {}  # key -> pool of the words accepted for that key
+
+    def pool(self, key, accept):
+        """Get the words of the lengths accepted by a length rule, built once per key
+
+        Parameters
+        ----------
+        key : hashable
+            Name of the rule (e.g. the difficulty)
+        accept : function
+            Takes a word and returns whether it is accepted, only depending on
+            the length of the word
+
+        Returns
+        -------
+        WordPool
+            Accepted words, shared by every caller
+        """
+        pool = self.pools.get(key)
+        if pool is None:
+            pool = self.pools[key] = WordPool(
+                [
+                    bucket
+                    for length, bucket in sorted(self.buckets.items())
+                    if len(bucket) and accept(bucket[0])
+                ]
+            )
+        return pool
+
+    def sampler(self, key, accept, rng=None):
+        """Get a new sampler of the pool of a length rule (see pool and WordSampler)"""
+        return WordSampler(self.pool(key, accept), rng)
+
+
+class PackBucket:
+    def __init__(self, pack, first, count):
+        """Read-only sequence of the words of a bucket of a word pack"""
+        self.pack = pack
+        self.first = first
+        self.count = count
+
+    def __len__(self):
+        return self.count
+
+    def __getitem__(self, i):
+        if not 0 <= i < self.count:
+            raise IndexError(i)
+        return self.pack.word(self.first + i)
+
+
+class WordPack:
+    def __init__(self, path):
+        """Memory-mapped word pack (see the module docstring for the format)
+
+        Parameters
+        ----------
+        path : str
+            Path of the pack
+
+        Raises
+        ------
+        ValueError
+            If the file isn't a word pack of a supported version
+        """
+        with open(path, "rb") as f:
+            self.map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, _, num_buckets, num_words = HEADER.unpack_from(self.map, 0)
+        if magic != PACK_MAGIC or version != PACK_VERSION:
+            raise ValueError(f"{path} is not a version {PACK_VERSION} word pack")
+
+        self.num_words = num_words
+        self.offsets_start = HEADER.size + num_buckets * BUCKET.size
+        self.data_start = self.offsets_start + (num_words + 1) * 4
+        self.buckets = {}  # length -> PackBucket
+        for i in range(num_buckets):
+            length, first, count = BUCKET.unpack_from(self.map, HEADER.size + i * BUCKET.size)
+            self.buckets[length] = PackBucket(self, first, count)
+
+    def word(self, i):
+        """Decode the i-th word of the pack"""
+        start, end = OFFSETS.unpack_from(self.map, self.offsets_start + i * 4)
+        return self.map[self.data_start + start:self.data_start + end].decode("utf-8")
+
+
+def bucket_words(words):
+    """Bucket words by length, dropping empty and duplicate words
+
+    Returns
+    -------
+    dict
+        Length -> list of the words of that length, in their original order
+    """
+    buckets = {}
+    for word in dict.fromkeys(words):
+        if word:
+            buckets.setdefault(len(word), []).append(word)
+    return buckets
+
+
+def read_words(path):
+    """Read a word list file (one word per line, blank lines are skipped)"""
+    with open(path, "r", encoding="utf-8") as reader:
+        return [word for word in (line.rstrip("\r\n") for line in reader) if word]
+
+
+def compile_pack(words, path):
+    """Write a word pack of a list of words
+
+    Parameters
+    ----------
+    words : iterable of str
+        Words, empty and duplicate words are dropped
+    path : str
+        Path of the pack to write
+    """
+    buckets = sorted(bucket_words(words).items())
+    table = []
+    offsets = [0]
+    data = []
+    first = 0
+    for length, bucket in buckets:
+        table.append(BUCKET.pack(length, first, len(bucket)))
+        first += len(bucket)
+        for word in bucket:
+            data.append(word.encode("utf-8"))
+            offsets.append(offsets[-1] + len(data[-1]))
+
+    with open(path, "wb") as f:
+        f.write(HEADER.pack(PACK_MAGIC, PACK_VERSION, 0, len(buckets), first))
+        f.write(b"".join(table))
+        f.write(struct.pack(f"<{len(offsets)}I", *offsets))
+        f.write(b"".join(data))
+
+
+class TrieNode:
+    def __init__(self):
+        """Node of a PrefixMatcher, one per prefix of the words"""
+        self.children = {}  # next character -> TrieNode
+        self.slots = set()  # slots of the words with this prefix
+        self.ends = set()  # slots of the words equal to this prefix
+
+
+class PrefixMatcher:
+    def __init__(self):
+        """Incremental case-insensitive matching of typed text against words in slots
+
+        The words are kept in a trie. The node of every prefix of the typed
+        text is kept on a stack, so typing or erasing a character is O(1)
+        whatever the number of words, and the candidates are read off the node
+        on top. Adding or removing a word re-walks the typed text.
+        """
+        self.root = TrieNode()
+        self.words = {}  # slot -> word
+        self.stack = [self.root]  # node of each typed prefix, None once no word matches
+        self.typed = []  # typed characters
+
+    def step(self, node, char):
+        """Get the child of a node for a typed character, None if there isn't one"""
+        for c in char.casefold():
+            if node is None:
+                return None
+            node = node.children.get(c)
+        return node
+
+    def resync(self):
+        """Rebuild the stack after the words changed"""
+        del self.stack[1:]
+        for char in self.typed:
+            self.stack.append(self.step(self.stack[-1], char))
+
+    def add(self, slot, word):
+        """Put a word in a slot, replacing the word in it ("" empties the slot)"""
+        self.remove(slot)
+        if not word:
+            return
+        self.words[slot] = word
+        node = self.root
+        node.slots.add(slot)
+        for c in word.casefold():
+            node = node.children.setdefault(c, TrieNode())
+            node.slots.add(slot)
+        node.ends.add(slot)
+        self.resync()
+
+    def remove(self, slot):
+        """Empty a slot"""
+        word = self.words.pop(slot, None)
+        if word is None:
+            return
+        node = self.root
+        node.slots.discard(slot)
+        for c in word.casefold():
+            child = node.children[c]
+            child.slots.discard(slot)
+            if not child.slots:
+                # no other word goes through the rest of the branch
+                del node.children[c]
+                break
+            node = child
+        else:
+            node.ends.discard(slot)
+        self.resync()
+
+    def push(self, text):
+        """Type characters"""
+        for char in text:
+            self.typed.append(char)
+            self.stack.append(self.step(self.stack[-1], char))
+
+    def pop(self):
+        """Erase the last typed character"""
+        if self.typed:
+            self.typed.pop()
+            self.stack.pop()
+
+    def clear(self):
+        """Erase the typed text"""
+        self.typed = []
+        del self.stack[1:]
+
+    def candidates(self):
+        """Get the slots of the words starting with the typed text
+
+        Returns
+        -------
+        set of int
+            Slots (don't modify the set), empty if nothing is typed
+        """
+        node = self.stack[-1]
+        if node is None or not self.typed:
+            return frozenset()
+        return node.slots
+
+    def match(self):
+        """Get the slot of a word equal to the typed text, None if there isn't one"""
+        node = self.stack[-1]
+        if node is None or not node.ends:
+            return None
+        return min(node.ends)
+
+    def unique_match(self):
+        """Get the slot of the word equal to the typed text if no other word
+        starts with it, None otherwise"""
+        node = self.stack[-1]
+        if node is None or len(node.slots) != 1 or not node.ends:
+            return None
+        return self.match()
+
+
+# path -> WordIndex of the word lists read so far
+indexes = {}
+
+
+def load(path):
+    """Get the index of a word list, read once per process
+
+    Parameters
+    ----------
+    path : str
+        Path of the word list, a word pack if it ends with .pack, else a text
+        file with one word per line
+
+    Returns
+    -------
+    WordIndex
+        Index of the words of the file
+    """
+    index = indexes.get(path)
+    if index is None:
+        if path.endswith(".pack"):
+            buckets = WordPack(path).buckets
+        else:
+            buckets = bucket_words(read_words(path))
+        index = indexes[path] = WordIndex(buckets)
+    return index
+
+
+if __name__ == "__main__":
+    compile_pack(read_words(sys.argv[1]), sys.argv[2])